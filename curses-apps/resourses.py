@@ -3,13 +3,36 @@
 Simple curses-based system monitor.
 Requirements: psutil (pip install psutil)
 GPU: will try to query `nvidia-smi` if available; otherwise shows N/A.
+
+Metrics are collected by a background Sampler (one thread per probe, each
+with its own interval) and published as immutable Snapshots; drawing only
+reads the latest snapshot and never waits on psutil or nvidia-smi.
+
+Other modes (see --help): --record/--replay a binary capture, --backend
+proc for direct /proc reads, --serve to export samples over HTTP.
 """
+import argparse
 import curses
+import heapq
+import json
+import math
+import os
 import psutil
+import re
+import select
 import shutil
+import signal
+import socketserver
+import stat
+import struct
 import subprocess
+import sys
+import threading
 import time
+from array import array
+from collections import namedtuple
 from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 REFRESH = 1.0  # seconds
 
@@ -38,6 +61,915 @@ def get_gpu_info():
         pass
     return "N/A"
 
+# ---------- Sampling ----------
+# Every field is None until its probe has run once.
+Snapshot = namedtuple("Snapshot", "time cpu per_core load mem swap disk partitions battery gpu procs disk_io net_io")
+Snapshot.__new__.__defaults__ = (None,) * len(Snapshot._fields)
+
+def probe_cpu():
+    # One percpu call per tick; the total is their mean
+    cores = tuple(psutil.cpu_percent(interval=None, percpu=True))
+    load = psutil.getloadavg() if hasattr(psutil, "getloadavg") else (0.0,0.0,0.0)
+    return {"cpu": sum(cores) / len(cores) if cores else 0.0, "per_core": cores, "load": load}
+
+def probe_memory():
+    return {"mem": psutil.virtual_memory(), "swap": psutil.swap_memory()}
+
+def probe_disks():
+    try:
+        du = psutil.disk_usage("/")
+    except Exception:
+        du = None
+    dlist = []
+    for p in psutil.disk_partitions(all=False):
+        try:
+            st = psutil.disk_usage(p.mountpoint)
+            dlist.append((st.percent, p.mountpoint))
+        except Exception:
+            continue
+    # show top 3 by percent
+    dlist.sort(reverse=True)
+    return {"disk": du, "partitions": tuple(dlist[:3])}
+
+def probe_battery():
+    return {"battery": psutil.sensors_battery()}
+
+def probe_gpu():
+    return {"gpu": get_gpu_info()}
+
+def probe_no_gpu():
+    return {"gpu": "N/A"}
+
+Proc = namedtuple("Proc", "pid name cpu rss io")      # cpu %, rss bytes, io bytes/s
+TopProcs = namedtuple("TopProcs", "cpu rss io")         # top-N Procs for each key
+TOP_N = 15
+PROC_CPU_BUDGET = 0.02   # max fraction of one CPU the process table may use
+
+class ProcessTable:
+    """Top-N processes by CPU, RSS and IO, computed from per-tick deltas.
+
+    process_iter() keeps its Process objects between calls and only reads
+    the attrs asked for; we keep each pid's last cpu/io counters keyed to
+    that Process object, so a recycled pid starts fresh. Selection uses
+    heapq.nlargest instead of sorting every process. On hosts with so many
+    processes that a scan costs more than PROC_CPU_BUDGET of the time since
+    the last one, ticks are skipped until it doesn't.
+    """
+    ATTRS = ["name", "cpu_times", "memory_info"]
+    # no per-process IO counters on macOS; asking for them there is an error
+    if hasattr(psutil.Process, "io_counters"):
+        ATTRS.append("io_counters")
+
+    def __init__(self, n=TOP_N):
+        self.n = n
+        self.prev = {}      # pid -> (Process, cpu seconds, io bytes)
+        self.last = None
+        self.cost = 0.0     # thread CPU seconds the last scan took
+
+    def probe(self):
+        now = time.monotonic()
+        dt = now - self.last if self.last else None
+        if dt and self.cost > dt * PROC_CPU_BUDGET:
+            return None
+        t0 = time.thread_time()
+        prev, cur, rows = self.prev, {}, []
+        for p in psutil.process_iter(self.ATTRS, ad_value=None):
+            info = p.info
+            ct, mi, io = info["cpu_times"], info["memory_info"], info.get("io_counters")
+            cpu = ct.user + ct.system if ct else 0.0
+            iob = io.read_bytes + io.write_bytes if io else 0
+            cur[p.pid] = (p, cpu, iob)
+            old = prev.get(p.pid)
+            if old is not None and old[0] is p and dt:
+                rows.append(Proc(p.pid, info["name"] or "?", (cpu - old[1]) / dt * 100.0,
+                                 mi.rss if mi else 0, (iob - old[2]) / dt))
+            else:
+                rows.append(Proc(p.pid, info["name"] or "?", 0.0, mi.rss if mi else 0, 0.0))
+        self.prev, self.last = cur, now
+        n = self.n
+        top = TopProcs(
+            tuple(heapq.nlargest(n, rows, key=lambda r: r.cpu)),
+            tuple(heapq.nlargest(n, rows, key=lambda r: r.rss)),
+            tuple(heapq.nlargest(n, rows, key=lambda r: r.io)))
+        self.cost = time.thread_time() - t0
+        return {"procs": top}
+
+DiskRate = namedtuple("DiskRate", "name read_bps write_bps read_iops write_iops peak")
+NetRate = namedtuple("NetRate", "name rx_bps tx_bps peak")   # peak: recent busiest total B/s
+DISK_FILTER = r"(?!loop|ram|zram)"
+NET_FILTER = r"(?!lo$)"
+PEAK_HALF_LIFE = 60.0   # seconds for a device's bar scale to halve after a burst
+PEAK_FLOOR = 1 << 20    # B/s; keeps an idle device's noise from filling its bar
+
+# Where each counter wraps; None means never in practice, so a drop is a
+# reset. diskstats fields are the kernel's unsigned long, 32 bits on 32-bit
+# systems (the byte counts are sectors * 512); network counters are 64-bit.
+if sys.maxsize > 1 << 32:
+    DISK_WRAPS = (None,) * 4
+else:
+    DISK_WRAPS = (1 << 32, 1 << 32, 512 << 32, 512 << 32)
+NET_WRAPS = (None, None)
+
+def counter_delta(cur, prev, wrap=None):
+    """cur - prev for an increasing counter that wraps at `wrap`.
+
+    A drop in a counter with no known wrap is a reset (NIC flap, driver
+    reload): the tick reports 0 rather than a made-up spike.
+    """
+    if cur >= prev:
+        return cur - prev
+    if wrap is not None and prev < wrap:
+        return cur + wrap - prev
+    return 0
+
+def psutil_disk_counters(keep):
+    # nowrap=False: counter_delta() already deals with wraps
+    return {n: (c.read_count, c.write_count, c.read_bytes, c.write_bytes)
+            for n, c in psutil.disk_io_counters(perdisk=True, nowrap=False).items() if keep(n)}
+
+def psutil_net_counters(keep):
+    return {n: (c.bytes_recv, c.bytes_sent)
+            for n, c in psutil.net_io_counters(pernic=True, nowrap=False).items() if keep(n)}
+
+class IORates:
+    """Per-device disk and per-NIC network rates from counter deltas.
+
+    Samples are timed with the monotonic clock. Devices whose name doesn't
+    match the filter regexes are dropped before any delta work (and, with
+    the /proc backend, before their line is even parsed).
+    """
+    def __init__(self, disk_filter=DISK_FILTER, net_filter=NET_FILTER,
+                 disk_counters=psutil_disk_counters, net_counters=psutil_net_counters):
+        self.keep_disk = re.compile(disk_filter).match
+        self.keep_net = re.compile(net_filter).match
+        self.disk_counters, self.net_counters = disk_counters, net_counters
+        self.prev = None
+        self.peak = {}
+
+    def probe(self):
+        now = time.monotonic()
+        disks = self.disk_counters(self.keep_disk)
+        nets = self.net_counters(self.keep_net)
+        prev, self.prev = self.prev, (now, disks, nets)
+        if prev is None:
+            return None
+        dt = now - prev[0]
+        if dt <= 0:
+            return None
+        peak = self.peak
+        decay = 0.5 ** (dt / PEAK_HALF_LIFE)
+        disk_io, net_io = [], []
+        for name, cur in disks.items():
+            old = prev[1].get(name)
+            if old is None:
+                continue
+            rc, wc, rb, wb = (counter_delta(c, o, w) / dt for c, o, w in zip(cur, old, DISK_WRAPS))
+            top = peak[name] = max(rb + wb, peak.get(name, 0.0) * decay, PEAK_FLOOR)
+            disk_io.append(DiskRate(name, rb, wb, rc, wc, top))
+        for name, cur in nets.items():
+            old = prev[2].get(name)
+            if old is None:
+                continue
+            rx, tx = (counter_delta(c, o, w) / dt for c, o, w in zip(cur, old, NET_WRAPS))
+            top = peak[name] = max(rx + tx, peak.get(name, 0.0) * decay, PEAK_FLOOR)
+            net_io.append(NetRate(name, rx, tx, top))
+        disk_io.sort(key=lambda r: r.read_bps + r.write_bps, reverse=True)
+        net_io.sort(key=lambda r: r.rx_bps + r.tx_bps, reverse=True)
+        return {"disk_io": tuple(disk_io), "net_io": tuple(net_io)}
+
+# (name, probe, interval seconds); interval None runs the probe only once.
+# Probes that keep state between ticks (procs, io) are not listed here:
+# make_probes() builds fresh ones for each Sampler.
+PROBES = [
+    ("cpu",     probe_cpu,     0.25),  # faster than REFRESH, for history
+    ("memory",  probe_memory,  1.0),
+    ("disks",   probe_disks,   5.0),
+    ("battery", probe_battery, 10.0),
+    ("gpu",     probe_gpu,     2.0),
+]
+
+# ---------- Linux /proc backend ----------
+class ProcBackend:
+    """Linux-only replacement for the cpu, memory and disk probes.
+
+    /proc/stat, /proc/meminfo and /proc/loadavg stay open and are re-read
+    with os.preadv into a reusable buffer per file (probes run on separate
+    threads and preadv releases the GIL); only the fields shown are
+    parsed. The mount list is parsed from /proc/self/mountinfo once and
+    again only after the kernel flags a change on it (POLLPRI). Results
+    have the same shape as the psutil probes.
+    """
+    MEMINFO = (b"MemTotal:", b"MemFree:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:")
+
+    def __init__(self):
+        names = ("stat", "meminfo", "loadavg", "diskstats", "net/dev")
+        self.fds = {name: os.open(f"/proc/{name}", os.O_RDONLY) for name in names}
+        self.bufs = {name: bytearray(1 << 16) for name in names}
+        self.prev_cpu = None
+        self.mount_fd = os.open("/proc/self/mountinfo", os.O_RDONLY)
+        self.mount_poll = select.poll()
+        self.mount_poll.register(self.mount_fd, select.POLLPRI | select.POLLERR)
+        self.mounts = None
+        with open("/proc/filesystems") as f:
+            self.real_fs = {ln.split()[0] for ln in f if not ln.startswith("nodev")}
+        self.real_fs.add("zfs")
+
+    def read(self, name):
+        # each file is read by one probe thread only, so its buffer isn't shared
+        fd, buf = self.fds[name], self.bufs[name]
+        n = os.preadv(fd, [buf], 0)
+        while n == len(buf):  # grew past the buffer (many cpus)
+            buf = self.bufs[name] = bytearray(2 * len(buf))
+            n = os.preadv(fd, [buf], 0)
+        return bytes(memoryview(buf)[:n])
+
+    def cpu(self):
+        cur = []
+        for line in self.read("stat").split(b"\n")[1:]:
+            if not line.startswith(b"cpu"):
+                break
+            f = [int(x) for x in line.split()[1:9]]  # user..steal
+            idle = f[3] + f[4]                      # idle + iowait
+            cur.append((sum(f), idle))
+        prev, self.prev_cpu = self.prev_cpu, cur
+        if prev is None or len(prev) != len(cur):
+            cores = (0.0,) * len(cur)
+        else:
+            cores = tuple(
+                round(100.0 * (1 - (idle - pi) / (total - pt)), 1) if total > pt else 0.0
+                for (total, idle), (pt, pi) in zip(cur, prev))
+        l1, l5, l15 = (float(x) for x in self.read("loadavg").split()[:3])
+        return {"cpu": sum(cores) / len(cores) if cores else 0.0, "per_core": cores,
+                "load": (l1, l5, l15)}
+
+    def memory(self):
+        want, got = self.MEMINFO, {}
+        for line in self.read("meminfo").split(b"\n"):
+            key, _, rest = line.partition(b" ")
+            if key in want:
+                got[key] = int(rest.split()[0]) * 1024
+                if len(got) == len(want):
+                    break
+        total, free = got[b"MemTotal:"], got[b"MemFree:"]
+        avail = got.get(b"MemAvailable:", free)
+        used = total - avail  # as psutil computes it on Linux
+        stotal = got[b"SwapTotal:"]
+        sused = stotal - got[b"SwapFree:"]
+        return {"mem": Usage(total, used, round(used / total * 100, 1) if total else 0.0),
+                "swap": Usage(stotal, sused, round(sused / stotal * 100, 1) if stotal else 0.0)}
+
+    def disk_counters(self, keep):
+        out = {}
+        for line in self.read("diskstats").splitlines():
+            f = line.split(None, 11)
+            name = f[2].decode()
+            if keep(name):
+                # reads, writes completed; sectors (512 bytes) read, written
+                out[name] = (int(f[3]), int(f[7]), int(f[5]) * 512, int(f[9]) * 512)
+        return out
+
+    def net_counters(self, keep):
+        out = {}
+        for line in self.read("net/dev").splitlines()[2:]:
+            name, _, rest = line.partition(b":")
+            name = name.strip().decode()
+            if keep(name):
+                f = rest.split(None, 9)
+                out[name] = (int(f[0]), int(f[8]))  # rx bytes, tx bytes
+        return out
+
+    def mountpoints(self):
+        if self.mounts is None or self.mount_poll.poll(0):
+            with open(self.mount_fd, "rb", closefd=False) as f:
+                f.seek(0)
+                data = f.read()  # reading clears the change flag
+            mounts = []
+            for line in data.splitlines():
+                head, _, tail = line.partition(b" - ")
+                fstype, device = tail.split()[:2]
+                if device and fstype.decode() in self.real_fs:
+                    mp = head.split()[4].decode("unicode_escape")  # \040 etc.
+                    mounts.append(mp)
+            self.mounts = mounts
+        return self.mounts
+
+    def disks(self):
+        du, dlist = None, []
+        for mp in self.mountpoints():
+            try:
+                u = statvfs_usage(mp)
+            except OSError:
+                continue
+            dlist.append((u.percent, mp))
+        try:
+            du = statvfs_usage("/")
+        except OSError:
+            pass
+        dlist.sort(reverse=True)
+        return {"disk": du, "partitions": tuple(dlist[:3])}
+
+def statvfs_usage(path):
+    st = os.statvfs(path)
+    total = st.f_blocks * st.f_frsize
+    used = (st.f_blocks - st.f_bfree) * st.f_frsize
+    avail = st.f_bavail * st.f_frsize
+    return Usage(total, used, round(used / (used + avail) * 100, 1) if used + avail else 0.0)
+
+def make_probes(backend="psutil", disk_filter=DISK_FILTER, net_filter=NET_FILTER):
+    """PROBES plus new process-table and IO probes; with backend "proc",
+    cpu/memory/disks/io read straight from /proc."""
+    if backend != "proc":
+        fast = {}
+        io = IORates(disk_filter, net_filter)
+    else:
+        pb = ProcBackend()
+        fast = {"cpu": pb.cpu, "memory": pb.memory, "disks": pb.disks}
+        io = IORates(disk_filter, net_filter, pb.disk_counters, pb.net_counters)
+    return [(n, fast.get(n, f), i) for n, f, i in PROBES] + [
+        ("procs", ProcessTable().probe, 2.0),
+        ("io",    io.probe,             1.0),
+    ]
+
+def bench_backends(n=500):
+    """Print per-sample cost of the psutil and /proc probes."""
+    for backend in ("psutil", "proc"):
+        probes = {name: fn for name, fn, _ in make_probes(backend)}
+        row = []
+        for name in ("cpu", "memory", "disks", "io"):
+            probes[name]()
+            t0 = time.perf_counter()
+            for _ in range(n):
+                probes[name]()
+            row.append(f"{name} {(time.perf_counter() - t0) / n * 1e6:8.1f}us")
+        print(f"{backend:>6}: " + "  ".join(row))
+
+# ---------- History ----------
+SPARK = "▁▂▃▄▅▆▇█"
+WINDOWS = (("1m", 60.0), ("5m", 300.0), ("15m", 900.0))
+
+class MetricHistory:
+    """Constant-memory history of one metric.
+
+    The last `capacity` samples live in an array ring for sparklines. For
+    the 1m/5m/15m stats, samples are folded into fixed BUCKET-second
+    buckets (min/max/sum/count, also array rings) as they arrive; window
+    stats over closed buckets are cached when a bucket closes, so a frame
+    only merges that cache with the open bucket.
+    """
+    BUCKET = 5.0
+
+    def __init__(self, capacity=240, span=WINDOWS[-1][1]):
+        self.capacity = capacity
+        self.raw = array("f", bytes(4 * capacity))
+        self.count = 0                      # total samples ever added
+        n = int(span // self.BUCKET)
+        self.nbuckets = n
+        self.b_id = array("q", [-1] * n)    # which bucket each slot holds
+        self.b_min = array("f", bytes(4 * n))
+        self.b_max = array("f", bytes(4 * n))
+        self.b_sum = array("d", bytes(8 * n))
+        self.b_cnt = array("l", bytes(array("l").itemsize * n))
+        self.cur = None                     # open bucket: [id, min, max, sum, n]
+        self.cache = {}                     # window seconds -> (min, max, sum, n)
+
+    def add(self, value, t=None):
+        t = time.time() if t is None else t
+        self.raw[self.count % self.capacity] = value
+        self.count += 1
+        bid = int(t // self.BUCKET)
+        cur = self.cur
+        if cur is None or cur[0] != bid:
+            if cur is not None:
+                self._close(cur, bid)
+            self.cur = [bid, value, value, value, 1]
+        else:
+            if value < cur[1]: cur[1] = value
+            if value > cur[2]: cur[2] = value
+            cur[3] += value
+            cur[4] += 1
+
+    def _close(self, cur, next_bid):
+        bid, lo, hi, total, n = cur
+        i = bid % self.nbuckets
+        self.b_id[i], self.b_min[i], self.b_max[i] = bid, lo, hi
+        self.b_sum[i], self.b_cnt[i] = total, n
+        # Refresh the per-window cache over closed buckets, once per bucket.
+        # Windows end at the bucket being opened, which stats() adds live.
+        for _, secs in WINDOWS:
+            first = next_bid - int(secs // self.BUCKET) + 1
+            agg = None
+            for j in range(self.nbuckets):
+                if first <= self.b_id[j] <= bid:
+                    if agg is None:
+                        agg = [self.b_min[j], self.b_max[j], self.b_sum[j], self.b_cnt[j]]
+                    else:
+                        agg[0] = min(agg[0], self.b_min[j])
+                        agg[1] = max(agg[1], self.b_max[j])
+                        agg[2] += self.b_sum[j]
+                        agg[3] += self.b_cnt[j]
+            self.cache[secs] = agg
+
+    def stats(self, secs):
+        """(min, max, avg) over the last `secs` seconds, or None if empty."""
+        cur = self.cur
+        if cur is None:
+            return None
+        lo, hi, total, n = cur[1], cur[2], cur[3], cur[4]
+        agg = self.cache.get(secs)
+        if agg:
+            lo, hi = min(lo, agg[0]), max(hi, agg[1])
+            total, n = total + agg[2], n + agg[3]
+        return lo, hi, total / n
+
+    def recent(self, n):
+        """Up to n newest samples, oldest first."""
+        n = min(n, self.count, self.capacity)
+        end = self.count % self.capacity
+        if n <= end:
+            return self.raw[end - n:end].tolist()
+        return (self.raw[self.capacity - (n - end):] + self.raw[:end]).tolist()
+
+def sparkline(values, top=100.0):
+    if not values:
+        return ""
+    k = len(SPARK) - 1
+    return "".join(SPARK[max(0, min(k, int(v / top * k + 0.5)))] for v in values)
+
+def record_history(hist, values, t):
+    """Append the percentage metrics in `values` to their histories."""
+    if values.get("cpu") is not None:
+        hist.setdefault("cpu", MetricHistory()).add(values["cpu"], t)
+        for i, c in enumerate(values["per_core"]):
+            hist.setdefault(f"cpu{i:02d}", MetricHistory()).add(c, t)
+    if values.get("mem") is not None:
+        hist.setdefault("mem", MetricHistory()).add(values["mem"].percent, t)
+    if values.get("swap") is not None:
+        hist.setdefault("swap", MetricHistory()).add(values["swap"].percent, t)
+
+class Sampler:
+    """Run each probe on its own daemon thread and publish Snapshots.
+
+    `snapshot` is replaced, never mutated, so readers can grab it without
+    locking. A slow probe (nvidia-smi) only delays its own metric.
+    """
+    def __init__(self, probes=None, history=True):
+        self.probes = list(probes) if probes is not None else make_probes()
+        self.keep_history = history   # False: snapshots only, no MetricHistory upkeep
+        if shutil.which("nvidia-smi") is None:
+            # no binary: report N/A once instead of forking every tick
+            self.probes = [(n, probe_no_gpu, None) if n == "gpu" else (n, f, i)
+                           for n, f, i in self.probes]
+        self.snapshot = Snapshot()
+        self.history = {}     # metric name -> MetricHistory, see record()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = [threading.Event() for _ in self.probes]
+
+    def start(self):
+        # initial call to populate cpu_percent baseline
+        psutil.cpu_percent(interval=None, percpu=True)
+        for (name, fn, interval), wake in zip(self.probes, self._wake):
+            t = threading.Thread(target=self._run, args=(fn, interval, wake),
+                                 name=f"probe-{name}", daemon=True)
+            t.start()
+        return self
+
+    def _run(self, fn, interval, wake):
+        while not self._stop.is_set():
+            try:
+                values = fn()
+                if values:  # a probe may return None to skip a tick
+                    self.publish(values)
+            except Exception:
+                pass  # keep the last good values
+            if interval is None:
+                return
+            wake.wait(interval)
+            wake.clear()
+
+    def publish(self, values):
+        now = time.time()
+        if self.keep_history:
+            self.record(values, now)
+        with self._lock:
+            self.snapshot = self.snapshot._replace(time=now, **values)
+
+    def record(self, values, t):
+        record_history(self.history, values, t)
+
+    def refresh(self):
+        """Ask every probe to sample again now."""
+        for wake in self._wake:
+            wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self.refresh()
+
+# ---------- Recording / replay ----------
+# File layout (little endian):
+#   header | segment 0 | segment 1 | ...
+#   segment = SEGMENT fixed-size records followed by one index block
+# Records are fixed size for a given file (the core count is in the header),
+# so record i lives at a computable offset and a reader can binary search
+# the index blocks, then the records of one segment, with a handful of
+# preads; nothing is loaded whole. The last segment may be partial and has
+# no index block yet.
+REC_MAGIC, IDX_MAGIC = b"RSRC", b"RIDX"
+HEADER = struct.Struct("<4sHHIId")     # magic, version, ncores, record size, segment, start
+RECORD = struct.Struct("<d5fQQfQQfQQfb")
+# t, cpu, load1/5/15, mem %/used/total, swap %/used/total, disk %/used/total,
+# battery % (nan: none), plugged; then ncores floats of per-core %
+INDEX = struct.Struct("<4sIddI4x")     # magic, segment no, first t, last t, count
+SEGMENT = 1024
+
+Usage = namedtuple("Usage", "total used percent")
+Battery = namedtuple("Battery", "percent power_plugged")
+
+def pack_snapshot(snap, t, ncores):
+    nan = float("nan")
+    def usage(u):
+        return (u.percent, u.used, u.total) if u is not None else (nan, 0, 0)
+    batt = snap.battery
+    cores = list(snap.per_core or ())[:ncores]
+    cores += [nan] * (ncores - len(cores))
+    return RECORD.pack(t, snap.cpu if snap.cpu is not None else nan, *(snap.load or (nan,) * 3),
+                       *usage(snap.mem), *usage(snap.swap), *usage(snap.disk),
+                       batt.percent if batt is not None else nan,
+                       bool(batt and batt.power_plugged)) + struct.pack(f"<{ncores}f", *cores)
+
+def unpack_snapshot(buf, offset, ncores):
+    (t, cpu, l1, l5, l15, mp, mu, mt, sp, su, st, dp, du, dt,
+     bp, plugged) = RECORD.unpack_from(buf, offset)
+    cores = struct.unpack_from(f"<{ncores}f", buf, offset + RECORD.size)
+    def usage(pct, used, total):
+        return None if math.isnan(pct) else Usage(total, used, round(pct, 1))
+    return Snapshot(
+        time=t, cpu=None if math.isnan(cpu) else cpu,
+        per_core=tuple(c for c in cores if not math.isnan(c)), load=(l1, l5, l15),
+        mem=usage(mp, mu, mt), swap=usage(sp, su, st), disk=usage(dp, du, dt),
+        partitions=(), battery=None if math.isnan(bp) else Battery(bp, bool(plugged)),
+        gpu="(not recorded)")
+
+class Recorder:
+    """Append-only writer for the recording format above."""
+    def __init__(self, path, ncores):
+        self.ncores = ncores
+        self.size = RECORD.size + 4 * ncores
+        self.f = open(path, "wb")
+        self.f.write(HEADER.pack(REC_MAGIC, 1, ncores, self.size, SEGMENT, time.time()))
+        self.count = 0
+        self.seg_first = 0.0
+
+    def append(self, snap, t):
+        if self.count % SEGMENT == 0:
+            self.seg_first = t
+        self.f.write(pack_snapshot(snap, t, self.ncores))
+        self.count += 1
+        if self.count % SEGMENT == 0:
+            self.f.write(INDEX.pack(IDX_MAGIC, self.count // SEGMENT - 1, self.seg_first, t, SEGMENT))
+            self.f.flush()
+
+    def close(self):
+        self.f.close()
+
+class Recording:
+    """Random access to a recording through os.pread; safe while it grows."""
+    def __init__(self, path):
+        self.fd = os.open(path, os.O_RDONLY)
+        head = os.pread(self.fd, HEADER.size, 0)
+        if len(head) < HEADER.size:
+            raise ValueError(f"{path}: not a recording")
+        magic, _, self.ncores, self.size, self.segment, self.start = HEADER.unpack(head)
+        if magic != REC_MAGIC:
+            raise ValueError(f"{path}: not a recording")
+        self.seg_bytes = self.segment * self.size + INDEX.size
+
+    def __len__(self):
+        body = os.fstat(self.fd).st_size - HEADER.size
+        full, rest = divmod(body, self.seg_bytes)
+        return full * self.segment + min(rest // self.size, self.segment)
+
+    def offset(self, i):
+        seg, k = divmod(i, self.segment)
+        return HEADER.size + seg * self.seg_bytes + k * self.size
+
+    def read(self, i):
+        return unpack_snapshot(os.pread(self.fd, self.size, self.offset(i)), 0, self.ncores)
+
+    def time_at(self, i):
+        return struct.unpack("<d", os.pread(self.fd, 8, self.offset(i)))[0]
+
+    def read_range(self, i, j):
+        """Yield snapshots i..j-1, one pread per segment touched."""
+        while i < j:
+            k = min(j, (i // self.segment + 1) * self.segment)
+            buf = os.pread(self.fd, (k - i) * self.size, self.offset(i))
+            for n in range(k - i):
+                yield unpack_snapshot(buf, n * self.size, self.ncores)
+            i = k
+
+    def find(self, t):
+        """Index of the last record at or before t (0 if t is before all)."""
+        n = len(self)
+        if n == 0:
+            return 0
+        # binary search complete segments by their index blocks' last time
+        lo, hi = 0, n // self.segment
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at = HEADER.size + mid * self.seg_bytes + self.segment * self.size
+            _, _, _, last, _ = INDEX.unpack(os.pread(self.fd, INDEX.size, at))
+            if last < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        # then the records of that one segment
+        a, b = lo * self.segment, min(n, (lo + 1) * self.segment)
+        while a < b:
+            mid = (a + b) // 2
+            if self.time_at(mid) <= t:
+                a = mid + 1
+            else:
+                b = mid
+        return max(0, a - 1)
+
+    def close(self):
+        os.close(self.fd)
+
+RECORDED = ("cpu", "memory", "disks", "battery")   # probes the format stores
+
+def probe_root_disk():
+    # the format keeps usage of / only, so skip enumerating partitions
+    return {"disk": statvfs_usage("/")}
+
+def stop_on_sigterm(signum, frame):
+    raise KeyboardInterrupt
+
+def record(path, interval, probes=PROBES):
+    """Headless: sample every `interval` seconds into path until Ctrl-C/SIGTERM.
+
+    Only the probes whose values are written run, and the sampler keeps no
+    history, so recording costs the host as little as possible.
+    """
+    probes = [(n, probe_root_disk if n == "disks" else f,
+               interval if n in ("cpu", "memory") else i)
+              for n, f, i in probes if n in RECORDED]
+    sampler = Sampler(probes, history=False).start()
+    time.sleep(interval)
+    rec = Recorder(path, psutil.cpu_count() or 1)
+    print(f"recording to {path} every {interval}s, Ctrl-C to stop", file=sys.stderr)
+    # a plain `kill` stops like Ctrl-C, so buffered samples are written
+    old_handler = signal.signal(signal.SIGTERM, stop_on_sigterm)
+    next_t = time.monotonic()
+    try:
+        while True:
+            rec.append(sampler.snapshot, time.time())
+            next_t += interval
+            time.sleep(max(0.0, next_t - time.monotonic()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, old_handler)
+        sampler.stop()
+        rec.close()
+    print(f"{rec.count} samples written", file=sys.stderr)
+
+class Replayer:
+    """Plays a Recording through the attributes main() reads from a Sampler."""
+    footer = "q:quit  space:play/pause  ←/→:±10s  PgUp/PgDn:±5m  g/G:start/end  +/-:speed  c:cores"
+
+    def __init__(self, rec):
+        self.rec = rec
+        self.playing = True
+        self.speed = 1.0
+        self.wall = time.monotonic()
+        self.seek(rec.start)
+
+    @property
+    def status(self):
+        t0 = self.rec.time_at(0) if len(self.rec) else self.rec.start
+        end = self.rec.time_at(len(self.rec) - 1) if len(self.rec) else t0
+        state = "▶" if self.playing else "Ⅱ"
+        return f"replay {fmt_span(self.clock - t0)}/{fmt_span(end - t0)} x{self.speed:g} {state}"
+
+    def seek(self, t):
+        """Jump to time t and rebuild history from the 15 minutes before it."""
+        rec = self.rec
+        if len(rec):
+            # g/G seek to -inf/inf; the history window must start from a real time
+            t = max(rec.time_at(0), min(t, rec.time_at(len(rec) - 1)))
+        self.pos = rec.find(t)
+        self.clock = t
+        self.history = {}
+        start = rec.find(t - WINDOWS[-1][1])
+        self.snapshot = Snapshot()
+        for snap in rec.read_range(start, min(self.pos + 1, len(rec))):
+            record_history(self.history, snap._asdict(), snap.time)
+            self.snapshot = snap
+
+    def tick(self):
+        now = time.monotonic()
+        if self.playing:
+            self.clock += (now - self.wall) * self.speed
+            n = len(self.rec)
+            if self.pos + 1 < n and self.rec.time_at(self.pos + 1) <= self.clock:
+                end = self.rec.find(self.clock) + 1
+                for snap in self.rec.read_range(self.pos + 1, end):
+                    record_history(self.history, snap._asdict(), snap.time)
+                    self.snapshot = snap
+                self.pos = end - 1
+            if n:
+                self.clock = min(self.clock, self.rec.time_at(n - 1))
+        self.wall = now
+
+    def handle_key(self, ch):
+        """Returns True if the key was a replay control."""
+        if ch == ord(' '):
+            self.playing = not self.playing
+        elif ch == curses.KEY_RIGHT:
+            self.seek(self.clock + 10)
+        elif ch == curses.KEY_LEFT:
+            self.seek(self.clock - 10)
+        elif ch == curses.KEY_NPAGE:
+            self.seek(self.clock + 300)
+        elif ch == curses.KEY_PPAGE:
+            self.seek(self.clock - 300)
+        elif ch == ord('g'):
+            self.seek(float("-inf"))
+        elif ch == ord('G'):
+            self.seek(float("inf"))
+        elif ch in (ord('+'), ord('=')):
+            self.speed = min(self.speed * 2, 256)
+        elif ch == ord('-'):
+            self.speed = max(self.speed / 2, 1 / 16)
+        else:
+            return False
+        return True
+
+    def refresh(self):
+        pass
+
+    def stop(self):
+        self.rec.close()
+
+# ---------- Metrics export ----------
+def _label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def prometheus_text(snap):
+    """Render a Snapshot in the Prometheus text exposition format."""
+    out = []
+    def metric(name, help_, samples):
+        samples = [(labels, v) for labels, v in samples if v is not None and not math.isnan(v)]
+        if not samples:
+            return
+        out.append(f"# HELP resources_{name} {help_}\n# TYPE resources_{name} gauge\n")
+        for labels, v in samples:
+            lab = ",".join(f'{k}="{_label(x)}"' for k, x in labels.items())
+            out.append(f"resources_{name}{{{lab}}} {v}\n" if lab else f"resources_{name} {v}\n")
+
+    metric("sample_timestamp_seconds", "Unix time of the latest sample.", [({}, snap.time)])
+    metric("cpu_percent", "Total CPU utilisation.", [({}, snap.cpu)])
+    metric("cpu_core_percent", "Per-core CPU utilisation.",
+           [({"core": i}, c) for i, c in enumerate(snap.per_core or ())])
+    metric("load_average", "System load average.",
+           [({"period": p}, v) for p, v in zip(("1m", "5m", "15m"), snap.load or ())])
+    for name, u in (("memory", snap.mem), ("swap", snap.swap), ("root_disk", snap.disk)):
+        if u is not None:
+            metric(f"{name}_bytes", f"{name} usage in bytes.",
+                   [({"kind": "used"}, u.used), ({"kind": "total"}, u.total)])
+            metric(f"{name}_percent", f"{name} usage percentage.", [({}, u.percent)])
+    metric("filesystem_used_percent", "Fullest mounted filesystems.",
+           [({"mountpoint": m}, pct) for pct, m in snap.partitions or ()])
+    if snap.battery is not None:
+        metric("battery_percent", "Battery charge.", [({}, snap.battery.percent)])
+        metric("battery_plugged", "1 if on AC power.", [({}, int(bool(snap.battery.power_plugged)))])
+    io = snap.disk_io or ()
+    metric("disk_bytes_per_second", "Disk throughput.",
+           [({"device": r.name, "op": "read"}, r.read_bps) for r in io]
+           + [({"device": r.name, "op": "write"}, r.write_bps) for r in io])
+    metric("disk_iops", "Disk operations per second.",
+           [({"device": r.name, "op": "read"}, r.read_iops) for r in io]
+           + [({"device": r.name, "op": "write"}, r.write_iops) for r in io])
+    net = snap.net_io or ()
+    metric("network_bytes_per_second", "Network throughput.",
+           [({"nic": r.name, "direction": "rx"}, r.rx_bps) for r in net]
+           + [({"nic": r.name, "direction": "tx"}, r.tx_bps) for r in net])
+    if snap.procs is not None:
+        metric("process_cpu_percent", "Top processes by CPU.",
+               [({"pid": p.pid, "name": p.name}, p.cpu) for p in snap.procs.cpu])
+        metric("process_rss_bytes", "Top processes by resident memory.",
+               [({"pid": p.pid, "name": p.name}, p.rss) for p in snap.procs.rss])
+    return "".join(out)
+
+def plain(value):
+    """Snapshot (and nested namedtuples) -> JSON-friendly structures."""
+    if hasattr(value, "_asdict"):
+        return {k: plain(v) for k, v in value._asdict().items()}
+    if isinstance(value, (tuple, list)):
+        return [plain(v) for v in value]
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+class ExportCache:
+    """Serialized forms of the source's current snapshot, built at most
+    once per snapshot however many scrapes arrive."""
+    def __init__(self, source):
+        self.source = source
+        self.lock = threading.Lock()
+        self.snap = None
+        self.forms = {}
+
+    def get(self, kind):
+        snap = self.source.snapshot
+        with self.lock:
+            if snap is not self.snap:
+                self.snap, self.forms = snap, {}
+            body = self.forms.get(kind)
+            if body is None:
+                if kind == "json":
+                    body = json.dumps(plain(snap)).encode()
+                else:
+                    body = prometheus_text(snap).encode()
+                self.forms[kind] = body
+            return body
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    routes = {
+        "/metrics": ("prometheus", "text/plain; version=0.0.4; charset=utf-8"),
+        "/metrics.json": ("json", "application/json"),
+        "/json": ("json", "application/json"),
+    }
+
+    def do_GET(self):
+        route = self.routes.get(self.path.split("?", 1)[0])
+        if route is None:
+            self.send_error(404)
+            return
+        body = self.server.cache.get(route[0])
+        self.send_response(200)
+        self.send_header("Content-Type", route[1])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # the curses UI owns the terminal
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        conn, _ = super().get_request()
+        return conn, ("unix", 0)  # handlers expect a (host, port) client address
+
+def parse_serve_spec(spec):
+    """PORT, HOST:PORT or unix:PATH -> ("unix", path) or (host, port).
+
+    Raises ValueError with a message fit for the command line.
+    """
+    if spec.startswith("unix:"):
+        path = spec[5:]
+        if not path:
+            raise ValueError("unix: needs a socket path")
+        try:
+            st = os.lstat(path)
+        except FileNotFoundError:
+            return ("unix", path)
+        if not stat.S_ISSOCK(st.st_mode):
+            raise ValueError(f"{path} exists and is not a socket")
+        return ("unix", path)
+    host, _, port = spec.rpartition(":")
+    if not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"expected PORT, HOST:PORT or unix:PATH, got {spec!r}")
+    return (host or "127.0.0.1", int(port))
+
+def bind_server(addr):
+    """Bind (but don't start) the metrics server for a parse_serve_spec() address."""
+    if addr[0] == "unix":
+        path = addr[1]
+        try:
+            if stat.S_ISSOCK(os.lstat(path).st_mode):
+                os.unlink(path)  # stale socket from an earlier run
+        except FileNotFoundError:
+            pass
+        return UnixHTTPServer(path, MetricsHandler)
+    server = ThreadingHTTPServer(addr, MetricsHandler)
+    server.daemon_threads = True
+    return server
+
+def serve(server, source):
+    """Serve source's snapshots from a bound server in a thread."""
+    server.cache = ExportCache(source)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+def fmt_span(secs):
+    secs = int(max(0, secs))
+    return f"{secs // 3600}:{secs // 60 % 60:02d}:{secs % 60:02d}"
+
 def human_bytes(n):
     # simple human readable transformation
     for unit in ["B","KiB","MiB","GiB","TiB"]:
@@ -60,118 +992,188 @@ def draw_progress(stdscr, y, x, width, percent, label=""):
     except curses.error:
         pass
 
-def render(stdscr, show_per_core=False):
+def draw_history(stdscr, y, x, width, hist, stats=True):
+    """Sparkline of recent samples, then min/avg/max per window if room."""
+    if hist is None or width < 4:
+        return
+    text = sparkline(hist.recent(min(width, 40)))
+    if stats:
+        text += "  min/avg/max"
+        for name, secs in WINDOWS:
+            st = hist.stats(secs)
+            if st:
+                text += f"  {name} {st[0]:.0f}/{st[2]:.0f}/{st[1]:.0f}"
+    try:
+        stdscr.addstr(y, x, text[:width])
+    except curses.error:
+        pass
+
+PROC_SORTS = ("cpu", "rss", "io")
+IO_ROWS = 4  # devices shown per IO panel
+
+def draw_io(stdscr, y, h, w, disk_io, net_io):
+    """Disk and network throughput bars from row y; returns the next free row."""
+    bar = min(22, w-2)
+    for title, rows, fmt in (
+            ("Disk IO", disk_io, lambda r: (r.read_bps + r.write_bps,
+                f"{r.name:<10} r {human_bytes(r.read_bps):>9}/s  w {human_bytes(r.write_bps):>9}/s"
+                f"  {r.read_iops:5.0f}/{r.write_iops:<5.0f} iops")),
+            ("Net", net_io, lambda r: (r.rx_bps + r.tx_bps,
+                f"{r.name:<10} rx {human_bytes(r.rx_bps):>9}/s  tx {human_bytes(r.tx_bps):>9}/s"))):
+        if rows is None or y >= h:
+            continue
+        try:
+            stdscr.addstr(y, 0, title, curses.A_BOLD)
+        except curses.error:
+            pass
+        y += 1
+        for r in rows[:IO_ROWS]:
+            if y >= h:
+                break
+            total, label = fmt(r)
+            # bars are relative to the device's recent peak, see PEAK_HALF_LIFE
+            draw_progress(stdscr, y, 0, bar, 100.0 * total / r.peak if r.peak else 0.0, label)
+            y += 1
+    return y
+
+def draw_procs(stdscr, y, h, w, top, sort):
+    """Process pane from row y down to h (exclusive)."""
+    if top is None or h - y < 2:
+        return
+    marks = {k: ("▼" if k == sort else " ") for k in PROC_SORTS}
+    header = f"{'PID':>7} {'NAME':<24} {marks['cpu']}{'CPU%':>6} {marks['rss']}{'RSS':>9} {marks['io']}{'IO/s':>9}"
+    try:
+        stdscr.addstr(y, 0, header[:w-1].ljust(w-1), curses.A_BOLD)
+        for i, p in enumerate(getattr(top, sort)[:h - y - 1]):
+            line = (f"{p.pid:>7} {p.name[:24]:<24}  {p.cpu:6.1f}  {human_bytes(p.rss):>9}"
+                    f"  {human_bytes(p.io):>9}")
+            stdscr.addstr(y + 1 + i, 0, line[:w-1])
+    except curses.error:
+        pass
+
+def render(stdscr, snap, show_per_core=False, history=None, footer=None, status="",
+           proc_sort="cpu"):
     h, w = stdscr.getmaxyx()
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    stdscr.addstr(0, 0, f"Resources app — {now}".ljust(w-1), curses.A_REVERSE)
+    now = datetime.fromtimestamp(snap.time) if snap.time else datetime.now()
+    title = f"Resources app — {now:%Y-%m-%d %H:%M:%S}  {status}"
+    stdscr.addstr(0, 0, title[:w-1].ljust(w-1), curses.A_REVERSE)
 
     # CPU summary
-    cpu_pct = psutil.cpu_percent(interval=None)
-    load1, load5, load15 = psutil.getloadavg() if hasattr(psutil, "getloadavg") else (0.0,0.0,0.0)
+    cpu_pct = snap.cpu or 0.0
+    load1, load5, load15 = snap.load or (0.0,0.0,0.0)
     stdscr.addstr(2, 0, f"CPU: {cpu_pct:5.1f}%   Load: {load1:.2f} {load5:.2f} {load15:.2f}")
     draw_progress(stdscr, 3, 0, min(40, w-2), cpu_pct, "")
+    history = history or {}
+    # min/avg/max per window
+    draw_history(stdscr, 4, 0, w-1, history.get("cpu"))
 
     # Per-core
+    cores = snap.per_core or ()
     if show_per_core:
-        cores = psutil.cpu_percent(interval=None, percpu=True)
         for i, c in enumerate(cores):
             y = 5 + i
             if y >= h-3: break
             label = f"cpu{i:02d}:{c:5.1f}%"
             draw_progress(stdscr, y, 0, min(36, w-2), c, label)
+            draw_history(stdscr, y, 52, min(20, w-53), history.get(f"cpu{i:02d}"), stats=False)
 
     # Memory
-    vm = psutil.virtual_memory()
-    mem_line = f"Mem: {human_bytes(vm.used)}/{human_bytes(vm.total)} ({vm.percent}%)"
-    y = 5 + (len(psutil.cpu_percent(percpu=True)) if show_per_core else 0)
+    y = 6 + (len(cores) if show_per_core else 0)
     if y+6 >= h:
         y = max(6, h-8)
-    stdscr.addstr(y, 0, mem_line)
-    draw_progress(stdscr, y+1, 0, min(40, w-2), vm.percent, "")
+    vm = snap.mem
+    if vm is not None:
+        stdscr.addstr(y, 0, f"Mem: {human_bytes(vm.used)}/{human_bytes(vm.total)} ({vm.percent}%)")
+        draw_progress(stdscr, y+1, 0, min(40, w-2), vm.percent, "")
+        draw_history(stdscr, y+2, 0, min(44, w-1), history.get("mem"), stats=False)
+    else:
+        stdscr.addstr(y, 0, "Mem: ...")
 
     # Swap
-    sw = psutil.swap_memory()
-    sw_line = f"Swap: {human_bytes(sw.used)}/{human_bytes(sw.total)} ({sw.percent}%)"
-    stdscr.addstr(y+3, 0, sw_line)
-    draw_progress(stdscr, y+4, 0, min(40, w-2), sw.percent, "")
+    sw = snap.swap
+    if sw is not None:
+        stdscr.addstr(y+3, 0, f"Swap: {human_bytes(sw.used)}/{human_bytes(sw.total)} ({sw.percent}%)")
+        draw_progress(stdscr, y+4, 0, min(40, w-2), sw.percent, "")
+        draw_history(stdscr, y+5, 0, min(44, w-1), history.get("swap"), stats=False)
 
     # Disk (root)
-    try:
-        du = psutil.disk_usage("/")
+    du = snap.disk
+    if du is not None:
         disk_line = f"Disk(/): {human_bytes(du.used)}/{human_bytes(du.total)} ({du.percent}%)"
         stdscr.addstr(y, 45, disk_line)
         draw_progress(stdscr, y+1, 45, min(40, w-45-2), du.percent, "")
-    except Exception:
+    else:
         stdscr.addstr(y, 45, "Disk: N/A")
 
     # Disk partitions summary (small)
-    try:
-        # show top 3 by percent
-        parts = psutil.disk_partitions(all=False)
-        dlist = []
-        for p in parts:
-            try:
-                st = psutil.disk_usage(p.mountpoint)
-                dlist.append((st.percent, p.mountpoint))
-            except Exception:
-                continue
-        dlist.sort(reverse=True)
-        for i, (pct, m) in enumerate(dlist[:3]):
-            stdscr.addstr(y+3+i, 45, f"{m} {pct}%")
-    except Exception:
-        pass
+    for i, (pct, m) in enumerate(snap.partitions or ()):
+        stdscr.addstr(y+3+i, 45, f"{m} {pct}%")
 
     # Battery
-    try:
-        batt = psutil.sensors_battery()
-        if batt is not None:
-            batt_pct = batt.percent
-            plugged = batt.power_plugged
-            bstatus = "Charging" if plugged else "Discharging"
-            stdscr.addstr(y+7, 0, f"Battery: {batt_pct:.0f}% ({bstatus})")
-            draw_progress(stdscr, y+8, 0, min(40, w-2), batt_pct, "")
-        else:
-            stdscr.addstr(y+7, 0, "Battery: N/A")
-    except Exception:
+    batt = snap.battery
+    if batt is not None:
+        bstatus = "Charging" if batt.power_plugged else "Discharging"
+        stdscr.addstr(y+7, 0, f"Battery: {batt.percent:.0f}% ({bstatus})")
+        draw_progress(stdscr, y+8, 0, min(40, w-2), batt.percent, "")
+    else:
         stdscr.addstr(y+7, 0, "Battery: N/A")
 
     # GPU
-    gpu = get_gpu_info()
-    stdscr.addstr(y+3, 0, f"GPU: {gpu}")
+    stdscr.addstr(y+3, 0, f"GPU: {snap.gpu or '...'}")
+
+    # Disk / network throughput, then processes
+    y = draw_io(stdscr, y+10, h-1, w, snap.disk_io, snap.net_io)
+    draw_procs(stdscr, y+1, h-1, w, snap.procs, proc_sort)
 
     # Footer help
-    footer = "q:quit  p:pause  c:toggle cores  r:refresh"
+    footer = footer or "q:quit  p:pause  c:toggle cores  o:process sort  r:refresh"
     try:
         stdscr.addstr(h-1, 0, footer.ljust(w-1), curses.A_REVERSE)
     except curses.error:
         pass
 
-def main(stdscr):
+def main(stdscr, sampler=None):
+    """Live view of a Sampler, or of a Replayer with --replay."""
     curses.curs_set(0)
     stdscr.nodelay(True)  # non-blocking getch
+    stdscr.keypad(True)
     show_per_core = False
+    proc_sort = "cpu"
     paused = False
     last = 0.0
 
-    # initial call to populate cpu_percent baseline
-    psutil.cpu_percent(interval=None)
+    sampler = sampler or Sampler().start()
+    replay = isinstance(sampler, Replayer)
     while True:
         now = time.time()
         ch = stdscr.getch()
         if ch != -1:
-            if ch in (ord('q'), 27):
+            if replay and sampler.handle_key(ch):
+                last = 0.0
+            elif ch in (ord('q'), 27):
+                sampler.stop()
                 break
             elif ch == ord('p'):
                 paused = not paused
             elif ch == ord('c'):
                 show_per_core = not show_per_core
+            elif ch == ord('o'):
+                proc_sort = PROC_SORTS[(PROC_SORTS.index(proc_sort) + 1) % len(PROC_SORTS)]
+                last = 0.0
             elif ch == ord('r'):
                 # immediate refresh
-                pass
+                sampler.refresh()
+                last = 0.0
 
+        if replay:
+            sampler.tick()
         if not paused and now - last >= REFRESH:
             stdscr.erase()
-            render(stdscr, show_per_core=show_per_core)
+            render(stdscr, sampler.snapshot, show_per_core=show_per_core,
+                   history=sampler.history,
+                   footer=sampler.footer if replay else None,
+                   status=sampler.status if replay else "",
+                   proc_sort=proc_sort)
             stdscr.refresh()
             last = now
         else:
@@ -179,9 +1181,67 @@ def main(stdscr):
             time.sleep(0.05)
 
 if __name__ == "__main__":
-    import sys
+    ap = argparse.ArgumentParser(prog="resourses.py", description="curses resource monitor")
+    ap.add_argument("--record", metavar="FILE", help="sample headlessly into FILE until Ctrl-C")
+    ap.add_argument("--interval", type=float, default=1.0,
+                    help="seconds between recorded samples (default 1.0)")
+    ap.add_argument("--replay", metavar="FILE", help="browse a recording in the UI")
+    ap.add_argument("--backend", choices=("psutil", "proc"), default="psutil",
+                    help="proc: read /proc directly for cpu/memory/disks (Linux)")
+    ap.add_argument("--bench-backend", action="store_true",
+                    help="time the psutil and proc probes and exit")
+    ap.add_argument("--disk-filter", metavar="REGEX", default=DISK_FILTER,
+                    help=f"only sample disks whose name matches (default {DISK_FILTER!r})")
+    ap.add_argument("--net-filter", metavar="REGEX", default=NET_FILTER,
+                    help=f"only sample NICs whose name matches (default {NET_FILTER!r})")
+    ap.add_argument("--serve", metavar="PORT|HOST:PORT|unix:PATH",
+                    help="expose the latest sample at /metrics (Prometheus) and /metrics.json")
+    ap.add_argument("--no-ui", action="store_true",
+                    help="don't start the curses display (use with --serve)")
+    args = ap.parse_args()
+    for opt, pattern in (("--disk-filter", args.disk_filter), ("--net-filter", args.net_filter)):
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            ap.error(f"{opt}: bad regex {pattern!r}: {e}")
+    if args.no_ui and not args.serve:
+        ap.error("--no-ui needs --serve")
+    if args.serve:
+        try:
+            serve_addr = parse_serve_spec(args.serve)
+        except ValueError as e:
+            ap.error(f"--serve: {e}")
     try:
-        curses.wrapper(main)
+        if args.bench_backend:
+            bench_backends()
+            sys.exit(0)
+        probes = make_probes(args.backend, args.disk_filter, args.net_filter)
+    except OSError as e:
+        # ProcBackend opens /proc files up front
+        ap.error(f"--backend proc needs Linux /proc: {e}")
+    if args.record:
+        record(args.record, max(0.01, args.interval), probes)
+        sys.exit(0)
+    server = None
+    if args.serve:
+        try:
+            server = bind_server(serve_addr)
+        except OSError as e:
+            ap.error(f"--serve {args.serve}: {e.strerror or e}")
+    try:
+        source = Replayer(Recording(args.replay)) if args.replay else Sampler(probes).start()
+        if server is not None:
+            serve(server, source)
+        if args.no_ui:
+            try:
+                while True:
+                    if isinstance(source, Replayer):
+                        source.tick()
+                    time.sleep(REFRESH)
+            except KeyboardInterrupt:
+                pass
+        else:
+            curses.wrapper(main, source)
     except Exception as e:
         print("Error running curses app:", e)
         sys.exit(1)
@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
-Tic-Tac-Toe curses game.
+Tic-Tac-Toe curses game, on N x N boards with k-in-a-row.
+Usage: tic_tac_toe.py [--size N] [--k K] [--think SECONDS] [--book PATH]
+       tic_tac_toe.py --solve [--size N] [--k K] [--book PATH]
+--solve writes an opening book for the board size; the CPU looks moves
+up there and only searches when no book exists.
 Keys:
   arrows / h j k l - move cursor
   Enter / Space - place mark
@@ -9,9 +13,16 @@ Keys:
   u - undo
   q - quit
 """
+import argparse
+import array
 import curses
 import copy
+import mmap
+import os
 import random
+import struct
+import sys
+import time
 
 EMPTY = " "
 PLAYER_X = "X"
@@ -32,10 +43,13 @@ def check_winner(board):
     return None
 
 def available_moves(board):
-    return [(r,c) for r in range(3) for c in range(3) if board[r][c] == EMPTY]
+    n = len(board)
+    return [(r,c) for r in range(n) for c in range(n) if board[r][c] == EMPTY]
 
-# simple minimax for CPU (O)
-def minimax(board, player):
+# simple minimax for CPU (O); stats, if given, is a one-item list counting nodes
+def minimax(board, player, stats=None):
+    if stats is not None:
+        stats[0] += 1
     winner = check_winner(board)
     if winner == PLAYER_O:
         return 1, None
@@ -51,7 +65,7 @@ def minimax(board, player):
         for mv in moves:
             r,c = mv
             board[r][c] = PLAYER_O
-            val, _ = minimax(board, PLAYER_X)
+            val, _ = minimax(board, PLAYER_X, stats)
             board[r][c] = EMPTY
             if val > best_val:
                 best_val = val
@@ -62,44 +76,470 @@ def minimax(board, player):
         for mv in moves:
             r,c = mv
             board[r][c] = PLAYER_X
-            val, _ = minimax(board, PLAYER_O)
+            val, _ = minimax(board, PLAYER_O, stats)
             board[r][c] = EMPTY
             if val < best_val:
                 best_val = val
                 best = mv
         return best_val, best
 
+# ---------- N x N, k-in-a-row engine ----------
+WIN = 1_000_000
+WIN_MIN = WIN - 10_000      # scores beyond this are forced wins/losses
+EVAL_MAX = WIN_MIN - 1      # static evaluations stay inside this
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class SearchTimeout(Exception):
+    pass
+
+class Engine:
+    """Alpha-beta searcher for N x N boards with k-in-a-row.
+
+    Positions are a pair of bitboards (bit r*n+c). Every k-long line is a
+    precomputed mask, and a move only tests the lines through its cell.
+    The transposition table is keyed by the smallest of the position's
+    eight Zobrist hashes (one per board symmetry, all updated with each
+    move), so symmetric positions share entries. Iterative deepening runs
+    until the position is solved or the time budget is spent.
+    """
+    MAX_TT = 2_000_000
+
+    def __init__(self, n=3, k=3, book=None):
+        self.n, self.k = n, k
+        self.book = book     # optional Book, consulted before searching
+        cells = n * n
+        self.full = (1 << cells) - 1
+        self.lines = []
+        for r in range(n):
+            for c in range(n):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    if 0 <= r + dr*(k-1) < n and 0 <= c + dc*(k-1) < n:
+                        self.lines.append(sum(1 << ((r + dr*i)*n + c + dc*i) for i in range(k)))
+        self.lines_at = [[m for m in self.lines if m >> i & 1] for i in range(cells)]
+        self.neigh = [sum(1 << (rr*n + cc)
+                          for rr in range(max(0, i//n - 1), min(n, i//n + 2))
+                          for cc in range(max(0, i%n - 1), min(n, i%n + 2)))
+                      for i in range(cells)]
+        last = n - 1
+        transforms = (lambda r, c: (r, c), lambda r, c: (c, last-r),
+                      lambda r, c: (last-r, last-c), lambda r, c: (last-c, r),
+                      lambda r, c: (r, last-c), lambda r, c: (last-r, c),
+                      lambda r, c: (c, r), lambda r, c: (last-c, last-r))
+        self.sym = [[t(i // n, i % n)[0]*n + t(i // n, i % n)[1] for i in range(cells)]
+                    for t in transforms]
+        self.inv = [[0]*cells for _ in transforms]
+        for s, perm in enumerate(self.sym):
+            for i, j in enumerate(perm):
+                self.inv[s][j] = i
+        rng = random.Random(0x7177)
+        zob = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(2)]
+        # zt[player][cell] -> the 8 hash deltas, one per symmetry
+        self.zt = [[tuple(zob[p][self.sym[s][i]] for s in range(8)) for i in range(cells)]
+                   for p in range(2)]
+        mid = (n - 1) / 2
+        self.centrality = [-(abs(i//n - mid) + abs(i%n - mid)) for i in range(cells)]
+        # A line holds at most k-1 stones when evaluate() runs (a full one is
+        # caught as a win first); pick the base so every line at that weight
+        # still sums below the mate band, or long lines would look solved.
+        base = 10
+        while base > 2 and len(self.lines) * base ** (k - 2) >= WIN_MIN:
+            base -= 1
+        self.weights = [0] + [base ** i for i in range(k)]
+        self.tt = {}
+        self.history = [0] * cells
+        self.nodes = 0
+        self.deadline = float("inf")
+        self.depth = 0       # depth reached by the last search
+        self.score = 0       # its score, from the mover's point of view
+        self.from_book = False
+
+    def wins(self, bits, cell):
+        """Does `bits` (one player's stones) have a line through cell?"""
+        return any(bits & m == m for m in self.lines_at[cell])
+
+    def threats(self, me, opp):
+        """Bitmask of empty cells where `me` would complete a line."""
+        out = 0
+        for m in self.lines:
+            if not m & opp:
+                rest = m & ~me
+                if rest and not rest & (rest - 1):
+                    out |= rest
+        return out
+
+    def evaluate(self, me, opp):
+        """Static score: open lines weighted by how many stones they hold."""
+        w, score = self.weights, 0
+        for m in self.lines:
+            if not m & opp:
+                score += w[(m & me).bit_count()]
+            elif not m & me:
+                score -= w[(m & opp).bit_count()]
+        return max(-EVAL_MAX, min(EVAL_MAX, score))
+
+    def candidates(self, empty, stones):
+        if self.n <= 4 or not stones:
+            return empty if stones or self.n <= 4 else 1 << (self.n * self.n // 2)
+        near = 0
+        while stones:
+            low = stones & -stones
+            near |= self.neigh[low.bit_length() - 1]
+            stones ^= low
+        return near & empty
+
+    def ordered(self, mask, first=-1):
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(low.bit_length() - 1)
+            mask ^= low
+        h, cen = self.history, self.centrality
+        cells.sort(key=lambda i: (i == first, h[i], cen[i]), reverse=True)
+        return cells
+
+    def keys_for(self, xbits, obits):
+        keys = [0] * 8
+        for p, bits in enumerate((xbits, obits)):
+            while bits:
+                low = bits & -bits
+                for s, z in enumerate(self.zt[p][low.bit_length() - 1]):
+                    keys[s] ^= z
+                bits ^= low
+        return tuple(keys)
+
+    def negamax(self, me, opp, turn, depth, alpha, beta, keys, root=False):
+        self.nodes += 1
+        if not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+        empty = self.full & ~(me | opp)
+        if not empty:
+            return 0
+        win_now = self.threats(me, opp)
+        if win_now:
+            if root:
+                self.best = (win_now & -win_now).bit_length() - 1
+            return WIN
+        block = self.threats(opp, me)
+        if block & (block - 1) and not root:
+            return -(WIN - 1)  # two open threats: lost whatever we do
+        if depth <= 0:
+            return self.evaluate(me, opp)
+
+        alpha0 = alpha
+        key = min(keys)
+        s = keys.index(key)
+        first = -1
+        entry = self.tt.get(key)
+        if entry is not None:
+            e_depth, flag, score, cmove = entry
+            if e_depth >= depth and not root:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+            first = self.inv[s][cmove]
+
+        best, best_move = -WIN - 1, -1
+        zt = self.zt[turn]
+        for cell in self.ordered(block or self.candidates(empty, me | opp), first):
+            child = tuple(k ^ z for k, z in zip(keys, zt[cell]))
+            v = -self.negamax(opp, me | (1 << cell), 1 - turn, depth - 1, -beta, -alpha, child)
+            # forced results lose a point per ply, so faster wins score higher
+            if v > WIN_MIN:
+                v -= 1
+            elif v < -WIN_MIN:
+                v += 1
+            if v > best:
+                best, best_move = v, cell
+                if v > alpha:
+                    alpha = v
+                    if alpha >= beta:
+                        self.history[cell] += depth * depth
+                        break
+
+        if len(self.tt) > self.MAX_TT:
+            self.tt.clear()
+        flag = UPPER if best <= alpha0 else LOWER if best >= beta else EXACT
+        self.tt[key] = (depth, flag, best, self.sym[s][best_move])
+        if root:
+            self.best = best_move
+        return best
+
+    def search(self, xbits, obits, player, budget=1.0):
+        """Best cell index for `player` ("X"/"O"), or None if the board is full."""
+        turn = 0 if player == PLAYER_X else 1
+        me, opp = (xbits, obits) if turn == 0 else (obits, xbits)
+        empties = (self.full & ~(xbits | obits)).bit_count()
+        if not empties:
+            return None
+        self.nodes = 0
+        keys = self.keys_for(xbits, obits)
+        self.from_book = False
+        if self.book is not None:
+            try:
+                cell = self.book.lookup(keys)
+            except (OSError, ValueError):
+                self.book, cell = None, None  # unreadable now: search live from here on
+            if cell is not None and not (xbits | obits) >> cell & 1:
+                self.from_book = True
+                return cell
+        self.deadline = time.perf_counter() + budget
+        best = None
+        for depth in range(1, empties + 1):
+            self.best = None
+            try:
+                score = self.negamax(me, opp, turn, depth, -WIN - 1, WIN + 1, keys, root=True)
+            except SearchTimeout:
+                if self.best is not None and best is None:
+                    best = self.best
+                break
+            best, self.depth, self.score = self.best, depth, score
+            if abs(score) > WIN_MIN:
+                break  # solved: a forced win or loss
+        if best is None:
+            best = self.ordered(self.candidates(self.full & ~(xbits | obits), xbits | obits))[0]
+        return best
+
+    def best_move(self, board, player, budget=1.0):
+        """Search a list-of-lists board; returns (r, c) or None."""
+        xbits = obits = 0
+        for r, row in enumerate(board):
+            for c, v in enumerate(row):
+                if v == PLAYER_X:
+                    xbits |= 1 << (r * self.n + c)
+                elif v == PLAYER_O:
+                    obits |= 1 << (r * self.n + c)
+        cell = self.search(xbits, obits, player, budget)
+        return None if cell is None else divmod(cell, self.n)
+
+# ---------- opening book ----------
+BOOK_MAGIC = b"TTTB"
+BOOK_HEADER = struct.Struct("<4sBBHII")   # magic, n, k, reserved, slots, count
+NO_MOVE = 0xFF
+
+def book_path(n, k):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), f"ttt_book_{n}x{n}_k{k}.bin")
+
+class Book:
+    """Best move for every reachable position, looked up by canonical hash.
+
+    The file is an open-addressing hash table: a header, `slots` 64-bit
+    canonical Zobrist keys, then `slots` move bytes (the cell in the
+    canonical orientation, NO_MOVE for an empty slot). Opening only
+    checks the header and size; the table is mapped on the first lookup.
+    """
+    def __init__(self, path, n, k):
+        self.path, self.n, self.k = path, n, k
+        self.keys = self.moves = None
+        self.engine = None
+
+    @classmethod
+    def open(cls, n, k, path=None):
+        """A Book for n/k if its file exists, else None (search live).
+
+        Raises ValueError if the file isn't a complete n x n, k-in-a-row book.
+        """
+        path = path or book_path(n, k)
+        if not os.path.exists(path):
+            return None
+        book = cls(path, n, k)
+        book.check()
+        return book
+
+    def check(self):
+        """Validate the header against the file; returns the slot count."""
+        try:
+            with open(self.path, "rb") as f:
+                head = f.read(BOOK_HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+        except OSError as e:
+            raise ValueError(f"{self.path}: {e.strerror}")
+        if len(head) < BOOK_HEADER.size or head[:4] != BOOK_MAGIC:
+            raise ValueError(f"{self.path}: not an opening book")
+        _, n, k, _, slots, count = BOOK_HEADER.unpack(head)
+        if (n, k) != (self.n, self.k):
+            raise ValueError(f"{self.path}: book is for {n}x{n} k={k}, "
+                             f"not {self.n}x{self.n} k={self.k}")
+        if not slots or slots & (slots - 1) or count >= slots or size != BOOK_HEADER.size + 9*slots:
+            raise ValueError(f"{self.path}: truncated or corrupt book")
+        return slots
+
+    def load(self):
+        slots = self.check()
+        with open(self.path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = BOOK_HEADER.size
+        if sys.byteorder == "little":
+            self.keys = memoryview(self.map)[start:start + 8*slots].cast("Q")
+        else:
+            self.keys = array.array("Q", self.map[start:start + 8*slots])
+            self.keys.byteswap()
+        self.moves = memoryview(self.map)[start + 8*slots:start + 9*slots]
+        self.mask = slots - 1
+        self.engine = Engine(self.n, self.k)
+
+    def lookup(self, keys):
+        """Cell index for the position with symmetric hashes `keys`, or None."""
+        if self.keys is None:
+            self.load()
+        key = min(keys)
+        i = key & self.mask
+        for _ in range(self.mask + 1):
+            move = self.moves[i]
+            if move == NO_MOVE:
+                break
+            if self.keys[i] == key:
+                if move >= self.n * self.n:
+                    break  # corrupt entry
+                return self.engine.inv[keys.index(key)][move]
+            i = (i + 1) & self.mask
+        return None
+
+    @staticmethod
+    def write(path, n, k, table):
+        """Write {canonical key: canonical move} as a book file."""
+        slots = 1
+        while slots < len(table) * 4 // 3 + 1:
+            slots <<= 1
+        keys = array.array("Q", bytes(8 * slots))
+        moves = bytearray([NO_MOVE]) * slots
+        mask = slots - 1
+        for key, move in table.items():
+            i = key & mask
+            while moves[i] != NO_MOVE:
+                i = (i + 1) & mask
+            keys[i], moves[i] = key, move
+        if sys.byteorder != "little":
+            keys.byteswap()
+        with open(path, "wb") as f:
+            f.write(BOOK_HEADER.pack(BOOK_MAGIC, n, k, 0, slots, len(table)))
+            f.write(keys.tobytes())
+            f.write(moves)
+        return BOOK_HEADER.size + 9 * slots
+
+def solve(n, k):
+    """Solve every position reachable from the empty board.
+
+    Returns {canonical key: best move in canonical orientation} for each
+    position that is not yet decided. Values are exact (no pruning), with
+    faster wins and slower losses preferred, as in Engine.negamax.
+    """
+    e = Engine(n, k)
+    full, zt, sym = e.full, e.zt, e.sym
+    order = e.ordered(full)
+    memo = {}
+
+    def value(me, opp, turn, keys):
+        key = min(keys)
+        hit = memo.get(key)
+        if hit is not None:
+            return hit[0]
+        empty = full & ~(me | opp)
+        best, best_cell = -WIN - 1, -1
+        for cell in order:
+            bit = 1 << cell
+            if not empty & bit:
+                continue
+            # keep expanding after a win is found, so positions where
+            # a player missed it are in the book too
+            if e.wins(me | bit, cell):
+                v = WIN
+            elif empty == bit:
+                v = 0
+            else:
+                child = tuple(a ^ b for a, b in zip(keys, zt[turn][cell]))
+                v = -value(opp, me | bit, 1 - turn, child)
+                if v > WIN_MIN:
+                    v -= 1
+                elif v < -WIN_MIN:
+                    v += 1
+            if v > best:
+                best, best_cell = v, cell
+        memo[key] = (best, sym[keys.index(key)][best_cell])
+        return best
+
+    value(0, 0, 0, (0,) * 8)
+    return {key: move for key, (_, move) in memo.items()}
+
+def solve_command(n, k, path):
+    """--solve: build the book for n/k and report time, size and lookup speed."""
+    t0 = time.perf_counter()
+    table = solve(n, k)
+    solve_time = time.perf_counter() - t0
+    size = Book.write(path, n, k, table)
+    print(f"{n}x{n} k={k}: {len(table)} canonical positions solved in {solve_time:.2f}s")
+    print(f"wrote {path}: {size} bytes ({size / max(1, len(table)):.1f} bytes/position)")
+
+    t0 = time.perf_counter()
+    book = Book.open(n, k, path)
+    book.lookup((0,) * 8)
+    load_time = time.perf_counter() - t0
+    probe = Engine(n, k, book)
+    reps = 10000
+    t0 = time.perf_counter()
+    for _ in range(reps):
+        probe.search(0, 0, PLAYER_X)
+    lookup_time = (time.perf_counter() - t0) / reps
+    live = Engine(n, k)
+    t0 = time.perf_counter()
+    live.search(0, 0, PLAYER_X, budget=60.0)
+    live_time = time.perf_counter() - t0
+    print(f"first move: book {lookup_time*1e6:.1f}us (load {load_time*1e3:.2f}ms), "
+          f"live search {live_time*1e3:.1f}ms, {live.nodes} nodes")
+
+def default_k(n):
+    return n if n <= 4 else 4
+
 class Game:
-    def __init__(self):
+    def __init__(self, n=3, k=None, think=1.0, book=None):
+        self.n = n
+        self.k = k or default_k(n)
+        self.think = think  # CPU time budget per move, seconds
+        self.engine = Engine(self.n, self.k, Book.open(self.n, self.k, book))
+        self.vs_cpu = False
         self.reset()
 
     def reset(self):
-        self.board = [[EMPTY]*3 for _ in range(3)]
+        n = self.n
+        self.board = [[EMPTY]*n for _ in range(n)]
+        self.bits = {PLAYER_X: 0, PLAYER_O: 0}
         self.turn = PLAYER_X
-        self.cursor = (1,1)
+        self.cursor = (n//2, n//2)
         self.history = []
         self.vs_cpu = False
+        self.result = None   # None, PLAYER_X, PLAYER_O or "D"
         self.msg = "X to play"
 
     def move_cursor(self, dr, dc):
         r,c = self.cursor
-        r = min(2, max(0, r+dr))
-        c = min(2, max(0, c+dc))
+        r = min(self.n-1, max(0, r+dr))
+        c = min(self.n-1, max(0, c+dc))
         self.cursor = (r,c)
 
     def place(self):
         r,c = self.cursor
+        if self.result:
+            self.msg = "Game over, press n to restart."
+            return
         if self.board[r][c] != EMPTY:
             self.msg = "Cell occupied!"
             return
         self.history.append((r,c,self.turn))
         self.board[r][c] = self.turn
-        winner = check_winner(self.board)
-        if winner:
-            if winner == "D":
-                self.msg = "Draw! press n to restart."
-            else:
-                self.msg = f"{winner} wins! press n to restart."
+        cell = r * self.n + c
+        self.bits[self.turn] |= 1 << cell
+        # only the lines through the new stone can have been completed
+        if self.engine.wins(self.bits[self.turn], cell):
+            self.result = self.turn
+            self.msg = f"{self.turn} wins! press n to restart."
+            return
+        if len(self.history) == self.n * self.n:
+            self.result = "D"
+            self.msg = "Draw! press n to restart."
             return
         # swap turn
         self.turn = PLAYER_O if self.turn == PLAYER_X else PLAYER_X
@@ -111,13 +551,15 @@ class Game:
             return
         r,c,player = self.history.pop()
         self.board[r][c] = EMPTY
+        self.bits[player] &= ~(1 << (r * self.n + c))
         self.turn = player
+        self.result = None
         self.msg = f"Undo, {self.turn} to play"
 
     def cpu_move(self):
         # CPU plays O
-        if self.vs_cpu and self.turn == PLAYER_O:
-            _, mv = minimax(self.board, PLAYER_O)
+        if self.vs_cpu and self.turn == PLAYER_O and not self.result:
+            mv = self.engine.best_move(self.board, PLAYER_O, self.think)
             if mv is None:
                 mv = random.choice(available_moves(self.board)) if available_moves(self.board) else None
             if mv:
@@ -128,13 +570,14 @@ class Game:
 def draw_board(stdscr, game):
     h,w = stdscr.getmaxyx()
     stdscr.clear()
-    start_y = max(1, (h - 9)//2)
-    start_x = max(2, (w - 25)//2)
+    n = game.n
+    start_y = max(1, (h - 3*n)//2)
+    start_x = max(2, (w - 8*n + 1)//2)
     # Title
-    stdscr.addstr(0, 0, "Tic-Tac-Toe (curses) - n: new  m: toggle CPU  u:undo  q:quit")
-    # draw a 3x3 grid
-    for r in range(3):
-        for c in range(3):
+    stdscr.addstr(0, 0, f"Tic-Tac-Toe {n}x{n}, {game.k} in a row - n: new  m: toggle CPU  u:undo  q:quit")
+    # draw the n x n grid
+    for r in range(n):
+        for c in range(n):
             cell_y = start_y + r*3
             cell_x = start_x + c*8
             ch = game.board[r][c]
@@ -151,23 +594,23 @@ def draw_board(stdscr, game):
             except curses.error:
                 pass
     # message
-    stdscr.addstr(start_y + 10, start_x, f"{game.msg}")
+    try:
+        stdscr.addstr(start_y + 3*n + 1, start_x, f"{game.msg}")
+    except curses.error:
+        pass
     stdscr.refresh()
 
-def main(stdscr):
+def main(stdscr, n=3, k=None, think=1.0, book=None):
     curses.curs_set(0)
-    g = Game()
+    g = Game(n, k, think, book)
     draw_board(stdscr, g)
     while True:
         # if vs cpu and it's cpu turn, let CPU play
-        if g.vs_cpu and g.turn == PLAYER_O:
+        if g.vs_cpu and g.turn == PLAYER_O and not g.result:
+            g.msg = "CPU thinking..."
+            draw_board(stdscr, g)
             g.cpu_move()
             draw_board(stdscr, g)
-            # check winner or continue
-            if check_winner(g.board):
-                # wait for key
-                key = stdscr.getch()
-                continue
 
         ch = stdscr.getch()
         if ch == -1:
@@ -194,6 +637,26 @@ def main(stdscr):
         draw_board(stdscr, g)
 
 if __name__ == "__main__":
-    import curses
-    curses.wrapper(main)
+    ap = argparse.ArgumentParser(prog="tic_tac_toe.py", description="curses tic-tac-toe")
+    ap.add_argument("--size", type=int, default=3, help="board is SIZE x SIZE (default 3)")
+    ap.add_argument("--k", type=int, help="marks in a row to win (default: size, or 4 above 4x4)")
+    ap.add_argument("--think", type=float, default=1.0, help="CPU seconds per move (default 1)")
+    ap.add_argument("--book", help="opening book file (default: ttt_book_NxN_kK.bin next to this script)")
+    ap.add_argument("--solve", action="store_true", help="solve all positions and write the opening book")
+    args = ap.parse_args()
+    if not 3 <= args.size <= 9:
+        ap.error("--size must be between 3 and 9")
+    if args.k is not None and not 3 <= args.k <= args.size:
+        ap.error("--k must be between 3 and --size")
+    if args.solve:
+        k = args.k or default_k(args.size)
+        solve_command(args.size, k, args.book or book_path(args.size, k))
+        sys.exit(0)
+    if args.book and not os.path.exists(args.book):
+        ap.error(f"--book: {args.book} does not exist (create it with --solve)")
+    try:
+        Book.open(args.size, args.k or default_k(args.size), args.book)
+    except ValueError as e:
+        ap.error(f"--book: {e}")
+    curses.wrapper(main, args.size, args.k, args.think, args.book)
 
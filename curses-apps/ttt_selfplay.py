@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Headless self-play between tic_tac_toe.py engines.
+
+Usage:
+  python ttt_selfplay.py ENGINE_A ENGINE_B [--games N] [--size N] [--k K] [--think SECONDS]
+                         [--opening-plies N] [--workers N] [--seed N] [--book PATH] [--out FILE]
+
+Engines:
+  minimax    the original full-width minimax (3x3 only)
+  random     uniformly random legal moves
+  alphabeta  Engine search with --think seconds per move, no book
+  book       Engine with the opening book (falls back to search without one)
+
+The engines swap X and O every game, and the first --opening-plies moves of each
+game are random so deterministic engines don't replay one game. Prints JSON
+results: win/draw/loss rates from each engine's side, nodes per second and
+per-move latency percentiles.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import tic_tac_toe as ttt
+
+ENGINES = ("minimax", "random", "alphabeta", "book")
+
+class Player:
+    """One engine seat: move(game) returns (r, c); nodes is set per move."""
+    def __init__(self, name, game, think, book, rng):
+        self.name, self.think, self.rng = name, think, rng
+        self.nodes = 0
+        if name == "alphabeta":
+            self.engine = ttt.Engine(game.n, game.k)
+        elif name == "book":
+            self.engine = ttt.Engine(game.n, game.k, ttt.Book.open(game.n, game.k, book))
+
+    def move(self, game):
+        if self.name == "random":
+            self.nodes = 0
+            return self.rng.choice(ttt.available_moves(game.board))
+        if self.name == "minimax":
+            stats = [0]
+            _, mv = ttt.minimax(game.board, game.turn, stats)
+            self.nodes = stats[0]
+            return mv
+        mv = self.engine.best_move(game.board, game.turn, self.think)
+        self.nodes = self.engine.nodes
+        return mv
+
+def play_games(job):
+    """Worker: play games [start, stop); returns one record per game."""
+    start, stop, opts = job
+    records = []
+    for i in range(start, stop):
+        rng = random.Random(opts["seed"] * 1_000_003 + i)
+        game = ttt.Game(opts["size"], opts["k"], opts["think"], opts["book"])
+        # fresh engines per game, so results don't depend on how games are split
+        players = [Player(name, game, opts["think"], opts["book"], rng) for name in opts["engines"]]
+        a_is_x = i % 2 == 0
+        seat = {ttt.PLAYER_X: 0 if a_is_x else 1, ttt.PLAYER_O: 1 if a_is_x else 0}
+        moves = ([], [])   # per engine: (seconds, nodes) for each searched move
+        while not game.result:
+            if len(game.history) < opts["opening_plies"]:
+                mv = rng.choice(ttt.available_moves(game.board))
+            else:
+                p = seat[game.turn]
+                t0 = time.perf_counter()
+                mv = players[p].move(game)
+                moves[p].append((time.perf_counter() - t0, players[p].nodes))
+            game.cursor = mv
+            game.place()
+        if game.result == "D":
+            winner = None
+        else:
+            winner = seat[game.result]
+        records.append((winner, moves))
+    return records
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    i = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[i]
+
+def summarize(records, opts, elapsed):
+    games = len(records)
+    out = []
+    for p, name in enumerate(opts["engines"]):
+        wins = sum(1 for winner, _ in records if winner == p)
+        losses = sum(1 for winner, _ in records if winner == 1 - p)
+        draws = games - wins - losses
+        times = sorted(t for _, moves in records for t, _ in moves[p])
+        nodes = sum(n for _, moves in records for _, n in moves[p])
+        busy = sum(times)
+        out.append({
+            "engine": name,
+            "wins": wins, "draws": draws, "losses": losses,
+            "win_rate": wins / games, "draw_rate": draws / games, "loss_rate": losses / games,
+            "moves": len(times),
+            "nodes": nodes,
+            "nodes_per_sec": round(nodes / busy) if nodes and busy else None,
+            "latency_ms": {f"p{q}": round(percentile(times, q) * 1000, 3) if times else None
+                           for q in (50, 90, 99, 100)},
+        })
+    return {"config": opts, "games": games, "elapsed_s": round(elapsed, 3), "engines": out}
+
+def main():
+    ap = argparse.ArgumentParser(description="Headless tic-tac-toe self-play")
+    ap.add_argument("engines", nargs=2, choices=ENGINES, metavar="ENGINE",
+                    help=f"two of: {', '.join(ENGINES)}")
+    ap.add_argument("--games", type=int, default=1000)
+    ap.add_argument("--size", type=int, default=3)
+    ap.add_argument("--k", type=int)
+    ap.add_argument("--think", type=float, default=0.1, help="search seconds per move (default 0.1)")
+    ap.add_argument("--opening-plies", type=int, default=2, help="random moves opening each game (default 2)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--book", help="opening book file for the book engine")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    args = ap.parse_args()
+    if args.games < 1:
+        ap.error("--games must be at least 1")
+    if args.workers < 1:
+        ap.error("--workers must be at least 1")
+    if "minimax" in args.engines and args.size != 3:
+        ap.error("minimax only plays 3x3")
+    if not 3 <= args.size <= 9:
+        ap.error("--size must be between 3 and 9")
+    k = args.k or ttt.default_k(args.size)
+    if not 3 <= k <= args.size:
+        ap.error("--k must be between 3 and --size")
+    if "book" in args.engines:
+        if args.book and not os.path.exists(args.book):
+            ap.error(f"--book: {args.book} does not exist")
+        try:
+            ttt.Book.open(args.size, k, args.book)
+        except ValueError as e:
+            ap.error(f"--book: {e}")
+
+    opts = {"engines": args.engines, "size": args.size, "k": k, "think": args.think,
+            "opening_plies": args.opening_plies, "seed": args.seed, "book": args.book,
+            "workers": args.workers}
+    chunk = max(1, min(50, args.games // (args.workers * 4) or 1))
+    jobs = [(i, min(i + chunk, args.games), opts) for i in range(0, args.games, chunk)]
+    t0 = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for batch in pool.map(play_games, jobs):
+            records.extend(batch)
+    report = summarize(records, opts, time.perf_counter() - t0)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
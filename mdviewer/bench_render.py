@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Time mdview.render_markdown on large files.
+
+Usage:
+  python bench_render.py <file.md> [file.md ...] [--width N] [--repeat N] [--against OTHER_mdview.py]
+  python bench_render.py <file.md> [file.md ...] --against OTHER_mdview.py --check
+
+--against loads another copy of mdview.py (e.g. `git show HEAD~1:mdviewer/mdview.py > old.py`)
+and times its render_markdown on the same input for comparison.
+
+--check instead compares the plain text both versions render for the files,
+plus EDGE_CASES, at several widths, and exits 1 if they differ. Whitespace is
+ignored, so changed wrap points pass but a lost bullet or a stray `*` does not.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import mdview
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location("mdview_other", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+EDGE_CASES = [
+    "- dash item", "* star item", "+ plus item", "  - nested item", "1. one", "2) two",
+    "**bold** and *em* and __bold__ and _em_", "***bold-italic*** and ___both___",
+    "`code span` and [link **bold**](http://example.com)",
+    "snake_case_name and a * b * c", "> quote with *em*", "# Heading *em*", "---",
+    "a-very-long-hyphenated-word-that-will-not-fit-on-one-narrow-line",
+]
+
+def plain(mod, lines, width):
+    return "".join("".join(item[0].split()) for item in mod.render_markdown(lines, width))
+
+def check(other, inputs, widths=(20, 40, 80)):
+    failed = 0
+    for name, lines in inputs:
+        for width in widths:
+            if plain(mdview, lines, width) != plain(other, lines, width):
+                print(f"{name}: plain text differs at width {width}")
+                failed += 1
+                break
+    return failed
+
+def best_of(fn, lines, width, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(lines, width)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark mdview.render_markdown")
+    ap.add_argument("files", nargs="+")
+    ap.add_argument("--width", type=int, default=100)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--against", help="path to another mdview.py to compare with")
+    ap.add_argument("--check", action="store_true", help="compare plain text with --against instead of timing")
+    args = ap.parse_args()
+    if args.check and not args.against:
+        ap.error("--check needs --against")
+
+    other = load_module(args.against) if args.against else None
+    inputs = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            inputs.append((path, f.readlines()))
+    if args.check:
+        inputs += [(f"edge case {case!r}", [case + "\n"]) for case in EDGE_CASES]
+        failed = check(other, inputs)
+        print(f"{len(inputs) - failed}/{len(inputs)} inputs render the same plain text")
+        sys.exit(1 if failed else 0)
+
+    for path, lines in inputs:
+        t = best_of(mdview.render_markdown, lines, args.width, args.repeat)
+        row = f"{os.path.basename(path):24} {len(lines):8} lines  current {t*1000:8.1f}ms"
+        if other:
+            t_other = best_of(other.render_markdown, lines, args.width, args.repeat)
+            row += f"  other {t_other*1000:8.1f}ms  speedup {t_other/t:5.2f}x"
+        print(row)
+
+if __name__ == "__main__":
+    main()
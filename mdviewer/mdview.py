@@ -1,135 +1,396 @@
 #!/usr/bin/env python3
 import curses, curses.textpad
 import sys, os, re, textwrap, time
+import argparse, codecs, ctypes, ctypes.util, hashlib, io, json
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_left, bisect_right
 
-HELP = "↑/k ↓/j: scroll  PgUp/PgDn  g/G: top/end  /:search  n/N: next/prev  r:reload  q:quit"
+FOLLOW_TICK_MS = 200
+
+HELP = ("↑/k ↓/j: scroll  PgUp/PgDn  g/G: top/end  /:search  n/N: next/prev  "
+        "[[/]]: prev/next heading  t:toc  #:jump to heading  r:reload  q:quit")
 
 # ---------- Markdown -> styled line tuples ----------
-# Each rendered item is (text, style) where style in:
+# Each rendered item is (text, style, runs) where style in:
 # 'normal','h1','h2','h3','h4','h5','h6','list','quote','code','hr'
+# and runs is a tuple of (start, end, kind) inline spans over text, kind in:
+# 'bold','em','code','link','url'
+# Passing a list as `toc` collects (rendered_line, level, title) for every
+# heading while rendering, for the heading index. Passing a dict as `state`
+# resumes from, and records, the cross-line state (open code fence), so a
+# document can be rendered in pieces.
 
 heading_re = re.compile(r'^(#{1,6})\s+(.*)$')
 ulist_re   = re.compile(r'^\s*[-*+]\s+(.*)$')
 olist_re   = re.compile(r'^\s*\d+[.)]\s+(.*)$')
 hr_re      = re.compile(r'^\s*([-*_])(?:\s*\1){2,}\s*$')
-link_re    = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+# One alternation for every inline span, so a line is scanned once:
+# `code` | [text](url) | ***both*** / ___both___ | **bold** / __bold__ | *em* / _em_
+inline_re  = re.compile(r'`([^`]+)`|\[([^\]]+)\]\(([^)]+)\)|(\*\*\*|___)(.+?)\4'
+                        r'|(\*\*|__)(.+?)\6|([*_])(.+?)\8')
+markup_re  = re.compile(r'[`\[*_]')
+
+def _inline(md, parts, runs, pos):
+    if not markup_re.search(md):
+        parts.append(md)
+        return pos + len(md)
+    last = 0
+    for m in inline_re.finditer(md):
+        if m.start() > last:
+            parts.append(md[last:m.start()])
+            pos += m.start() - last
+        last = m.end()
+        code, ltext, url, both, bold, em = m.group(1, 2, 3, 5, 7, 9)
+        if code is not None:
+            parts.append(code)
+            runs.append((pos, pos + len(code), "code"))
+            pos += len(code)
+            continue
+        # Outer span goes in first so nested spans are painted over it
+        i = len(runs)
+        runs.append(None)
+        start = pos
+        if ltext is not None:
+            # [text](url) -> "text <url>"
+            pos = _inline(ltext, parts, runs, pos)
+            runs[i] = (start, pos, "link")
+            parts.append(f" <{url}>")
+            runs.append((pos + 1, pos + len(url) + 3, "url"))
+            pos += len(url) + 3
+        elif both is not None:
+            runs.append(None)
+            pos = _inline(both, parts, runs, pos)
+            runs[i], runs[i + 1] = (start, pos, "bold"), (start, pos, "em")
+        else:
+            pos = _inline(bold if bold is not None else em, parts, runs, pos)
+            runs[i] = (start, pos, "bold" if bold is not None else "em")
+    if last < len(md):
+        parts.append(md[last:])
+        pos += len(md) - last
+    return pos
+
+def parse_inline(md: str):
+    """Strip inline markup in a single scan; return (text, runs)."""
+    parts, runs = [], []
+    _inline(md, parts, runs, 0)
+    return "".join(parts), tuple(runs)
+
+def upper_runs(text, runs):
+    """Uppercase text, moving runs along where case mapping changes length (ß -> SS)."""
+    out, starts, pos = [], [], 0
+    for ch in text:
+        starts.append(pos)
+        ch = ch.upper()
+        out.append(ch)
+        pos += len(ch)
+    starts.append(pos)
+    return "".join(out), tuple((starts[s], starts[e], k) for s, e, k in runs)
 
 def strip_inline(md: str) -> str:
-    # Convert [text](url) -> "text <url>"
-    def repl(m):
-        return f"{m.group(1)} <{m.group(2)}>"
-    s = link_re.sub(repl, md)
-    # Remove emphasis markers **, __, *, _ around words (simple)
-    s = re.sub(r'(\*\*|__)(.*?)\1', r'\2', s)
-    s = re.sub(r'(\*|_)(.*?)\1', r'\2', s)
-    # Inline code: `x` -> x
-    s = re.sub(r'`([^`]+)`', r'\1', s)
-    return s
-
-def render_markdown(lines, width):
+    return parse_inline(md)[0]
+
+def clip_runs(runs, start, end, shift=0):
+    return tuple((max(s, start) - start + shift, min(e, end) - start + shift, k)
+                 for s, e, k in runs if s < end and e > start)
+
+def wrap_runs(text, runs, width, first="", rest=""):
+    """Greedy word wrap that keeps inline runs aligned with the wrapped text.
+
+    Every output line is prefix + a contiguous slice of text, so runs only
+    need clipping and shifting. Returns a list of (line, runs); empty for
+    blank text. Like textwrap, the first line keeps its leading indent and
+    words longer than the line are broken.
+    """
+    if not text.strip():
+        return []
+    out = []
+    prefix, pos, n = first, 0, len(text)
+    while pos < n:
+        room = max(1, width - len(prefix))
+        if n - pos <= room:
+            end = nxt = n
+        else:
+            end = text.rfind(" ", pos, pos + room + 1)
+            if end <= pos or not text[pos:end].strip():
+                end = pos + room
+            nxt = end
+        line = text[pos:end].rstrip(" ")
+        out.append((prefix + line,
+                    clip_runs(runs, pos, pos + len(line), len(prefix)) if runs else ()))
+        prefix, pos = rest, nxt
+        while pos < n and text[pos] == " ":
+            pos += 1
+    return out
+
+def render_markdown(lines, width, toc=None, state=None):
     rendered = []
-    in_code = False
+    in_code = state.get("in_code", False) if state else False
+    rule = ("─" * max(1, width-2), "hr", ())
     for raw in lines:
         line = raw.rstrip("\n")
+        if not in_code and "\t" in line:
+            line = line.expandtabs()
+        body = line.lstrip()
+        # Block type is decided from the first non-blank character, so each
+        # line runs at most one block regex instead of trying all of them.
+        lead = body[:1]
 
         # Code fences
-        if line.strip().startswith("```"):
+        if lead == "`" and body.startswith("```"):
             in_code = not in_code
-            if in_code:
-                rendered.append(("─" * max(1, width-2), "hr"))
-            else:
-                rendered.append(("─" * max(1, width-2), "hr"))
+            rendered.append(rule)
             continue
 
         if in_code:
             # Keep indentation; wrap but preserve code feel
             if not line:
-                rendered.append(("", "code"))
+                rendered.append(("", "code", ()))
                 continue
             wrapped = textwrap.wrap(line, width=width-2, replace_whitespace=False,
                                     drop_whitespace=False, subsequent_indent="")
-            if not wrapped:
-                rendered.append(("", "code"))
             for w in wrapped or [""]:
-                rendered.append((w, "code"))
+                rendered.append((w, "code", ()))
             continue
 
-        # Horizontal rule
-        if hr_re.match(line):
-            rendered.append(("─" * max(1, width-2), "hr"))
-            continue
-
-        # Headings
-        m = heading_re.match(line)
-        if m:
-            level = len(m.group(1))
-            text  = strip_inline(m.group(2)).strip()
-            style = f"h{level}"
-            # Slight visual pop: add underline for h1/h2
-            if level <= 2:
-                text = text.upper()
-            wrapped = textwrap.wrap(text, width=width-2) or [""]
-            for w in wrapped:
-                rendered.append((w, style))
-            if level <= 2:
-                rendered.append(("─" * min(len(text), width-2), "hr"))
-            continue
+        if lead and lead in "-*_+":
+            # Horizontal rule
+            if hr_re.match(line):
+                rendered.append(rule)
+                continue
+            # Lists
+            m = ulist_re.match(line)
+            if m:
+                text, runs = parse_inline(m.group(1))
+                wrapped = wrap_runs(text, runs, width-2, "• ", "    ")
+                rendered.extend((w, "list", r) for w, r in wrapped or [("• ", ())])
+                continue
 
-        # Lists
-        m = ulist_re.match(line)
-        if m:
-            content = strip_inline(m.group(1))
-            bullet = "• "
-            wrapped = textwrap.wrap(content, width=width-4,
-                                    subsequent_indent="  ")
-            if not wrapped:
-                rendered.append((f"{bullet}", "list"))
-            else:
-                rendered.append((bullet + wrapped[0], "list"))
-                for w in wrapped[1:]:
-                    rendered.append(("  " + w, "list"))
-            continue
+        elif lead == "#":
+            # Headings
+            m = heading_re.match(line)
+            if m:
+                level = len(m.group(1))
+                text, runs = parse_inline(m.group(2).strip())
+                text = text.rstrip()
+                style = f"h{level}"
+                if toc is not None:
+                    toc.append((len(rendered), level, text))
+                # Slight visual pop: add underline for h1/h2
+                if level <= 2:
+                    text, runs = upper_runs(text, runs)
+                wrapped = wrap_runs(text, runs, width-2) or [("", ())]
+                rendered.extend((w, style, r) for w, r in wrapped)
+                if level <= 2:
+                    rendered.append(("─" * min(len(text), width-2), "hr", ()))
+                continue
 
-        m = olist_re.match(line)
-        if m:
-            # Keep original number if possible
-            num = line.strip().split()[0]
-            content = strip_inline(line[line.find(num)+len(num):].lstrip(". )"))
-            prefix = f"{num} "
-            wrapw = max(1, width - (len(prefix)+2))
-            wrapped = textwrap.wrap(content, width=wrapw,
-                                    subsequent_indent=" " * len(prefix))
-            if not wrapped:
-                rendered.append((prefix, "list"))
-            else:
-                rendered.append((prefix + wrapped[0], "list"))
-                for w in wrapped[1:]:
-                    rendered.append((w, "list"))
-            continue
+        elif lead.isdigit():
+            m = olist_re.match(line)
+            if m:
+                # Keep original number if possible
+                num = body.split()[0]
+                prefix = f"{num} "
+                text, runs = parse_inline(m.group(1))
+                wrapped = wrap_runs(text, runs, width-2, prefix, " " * len(prefix))
+                rendered.extend((w, "list", r) for w, r in wrapped or [(prefix, ())])
+                continue
 
-        # Blockquote
-        if line.lstrip().startswith(">"):
-            text = strip_inline(line.lstrip()[1:].lstrip())
-            wrapped = textwrap.wrap(text, width=width-4, subsequent_indent="  ")
-            bar = "│ "
-            if not wrapped:
-                rendered.append((bar, "quote"))
-            else:
-                rendered.append((bar + wrapped[0], "quote"))
-                for w in wrapped[1:]:
-                    rendered.append(("  " + w, "quote"))
+        elif lead == ">":
+            # Blockquote
+            text, runs = parse_inline(body[1:].lstrip())
+            wrapped = wrap_runs(text, runs, width-2, "│ ", "    ")
+            rendered.extend((w, "quote", r) for w, r in wrapped or [("│ ", ())])
             continue
 
         # Paragraph / blank
-        text = strip_inline(line)
-        if not text.strip():
-            rendered.append(("", "normal"))
+        text, runs = parse_inline(line)
+        wrapped = wrap_runs(text, runs, width-2)
+        if not wrapped:
+            rendered.append(("", "normal", ()))
             continue
-        wrapped = textwrap.wrap(text, width=width-2) or [""]
-        for w in wrapped:
-            rendered.append((w, "normal"))
+        rendered.extend((w, "normal", r) for w, r in wrapped)
+    if state is not None:
+        state["in_code"] = in_code
     return rendered
 
+# ---------- File following ----------
+IN_MODIFY, IN_ATTRIB, IN_MOVE_SELF, IN_DELETE_SELF = 0x2, 0x4, 0x800, 0x400
+line_re = re.compile(r'[^\n]*\n|[^\n]+')
+
+class FileWatcher:
+    """Tell whether a file may have changed, without blocking.
+
+    Uses inotify on Linux (through libc, no extra packages) and falls back
+    to stat polling every `interval` seconds elsewhere.
+    """
+    def __init__(self, path, interval=0.5):
+        self.path = path
+        self.interval = interval
+        self.last_poll = 0.0
+        self.fd = None
+        self.libc = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                self.libc, self.fd = libc, fd
+                self.rewatch()
+        except (OSError, AttributeError):
+            self.fd = None
+
+    def rewatch(self):
+        """(Re)attach to whatever file is at path now, e.g. after rotation."""
+        if self.fd is None:
+            return
+        mask = IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF
+        if self.libc.inotify_add_watch(self.fd, os.fsencode(self.path), mask) < 0:
+            os.close(self.fd)
+            self.fd = None
+
+    def changed(self):
+        if self.fd is None:
+            now = time.monotonic()
+            if now - self.last_poll < self.interval:
+                return False
+            self.last_poll = now
+            return True  # caller stats the file to see what changed
+        hit = False
+        try:
+            while os.read(self.fd, 4096):
+                hit = True
+        except BlockingIOError:
+            pass
+        return hit
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+# ---------- Batch rendering (no curses) ----------
+# SGR codes mirroring init_colors()/style_attr() and run_attr()
+ANSI_STYLE = {
+    "hr": "2;37", "list": "32", "quote": "34", "code": "30;47",
+    "h1": "1;36", "h2": "1;33", "h3": "1;35", "h4": "1;37", "h5": "37", "h6": "2;37",
+}
+ANSI_RUN = {"bold": "1", "em": "3", "code": "30;47", "link": "4;34", "url": "2"}
+MANIFEST = ".mdview-manifest.json"
+
+def to_ansi(text, style, runs):
+    base = ANSI_STYLE.get(style)
+    if not runs:
+        return f"\x1b[{base}m{text}\x1b[0m" if base and text else text
+    cuts = sorted({0, len(text)} | {p for s, e, _ in runs for p in (s, e)})
+    out = []
+    for a, b in zip(cuts, cuts[1:]):
+        codes = [base] if base else []
+        codes += [ANSI_RUN[k] for s, e, k in runs if s <= a and b <= e]
+        seg = text[a:b]
+        out.append(f"\x1b[{';'.join(codes)}m{seg}\x1b[0m" if codes else seg)
+    return "".join(out)
+
+def file_digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def render_file(src, dst, width, fmt, old_digest=None):
+    """Render one file to dst unless its content hash matches old_digest.
+
+    Returns (digest, rendered). Output is written line by line to a temp
+    file and moved into place, so readers never see a half-written file.
+    """
+    digest = file_digest(src)
+    if digest == old_digest and os.path.exists(dst):
+        return digest, False
+    with open(src, "r", encoding="utf-8", errors="replace") as f:
+        view = render_markdown(f.readlines(), width)
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp = dst + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as out:
+        for text, style, runs in view:
+            out.write((to_ansi(text, style, runs) if fmt == "ansi" else text) + "\n")
+    os.replace(tmp, dst)
+    return digest, True
+
+def _render_job(job):
+    rel, src, dst, width, fmt, old_digest = job
+    try:
+        return (rel,) + render_file(src, dst, width, fmt, old_digest) + (None,)
+    except OSError as e:
+        return rel, None, False, str(e)
+
+def render_tree(src_dir, out_dir, width=80, fmt="text", jobs=None):
+    """Render every .md under src_dir into out_dir across a process pool.
+
+    A manifest in out_dir records (mtime_ns, size, digest) per file: files
+    with unchanged mtime and size are skipped without being read, and files
+    whose content hash is unchanged are not rendered again. Outputs of
+    sources that are gone, or in a format no longer written, are removed.
+    Returns (rendered, unchanged, failed, removed) counts.
+    """
+    ext = ".ans" if fmt == "ansi" else ".txt"
+    mpath = os.path.join(out_dir, MANIFEST)
+    try:
+        with open(mpath, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    settings = {"width": width, "format": fmt}
+    old_files = manifest.get("files", {})
+    old_ext = ".ans" if (manifest.get("settings") or {}).get("format") == "ansi" else ".txt"
+    entries = old_files if manifest.get("settings") == settings else {}
+
+    found, todo = {}, []
+    for root, _, names in os.walk(src_dir):
+        for name in names:
+            if not name.endswith(".md"):
+                continue
+            src = os.path.join(root, name)
+            rel = os.path.relpath(src, src_dir)
+            dst = os.path.join(out_dir, rel[:-3] + ext)
+            st = os.stat(src)
+            old = entries.get(rel)
+            found[rel] = (st.st_mtime_ns, st.st_size)
+            if old and old[:2] == [st.st_mtime_ns, st.st_size] and os.path.exists(dst):
+                continue
+            todo.append((rel, src, dst, width, fmt, old[2] if old else None))
+
+    removed = 0
+    for rel in old_files:
+        if rel in found and old_ext == ext:
+            continue
+        if os.path.isabs(rel) or rel.startswith(".."):
+            continue  # only ever delete inside out_dir
+        stale = os.path.join(out_dir, rel[:-3] + old_ext)
+        try:
+            os.remove(stale)
+            removed += 1
+        except FileNotFoundError:
+            pass
+    done = skipped = failed = 0
+    files = {rel: entries[rel] for rel in found if rel in entries}
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for rel, digest, rendered, err in pool.map(_render_job, todo, chunksize=16):
+                if err:
+                    print(f"{rel}: {err}", file=sys.stderr)
+                    files.pop(rel, None)
+                    failed += 1
+                    continue
+                files[rel] = list(found[rel]) + [digest]
+                done += rendered
+                skipped += not rendered
+    skipped += len(found) - len(todo)
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(mpath + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"settings": settings, "files": files}, f)
+    os.replace(mpath + ".tmp", mpath)
+    return done, skipped, failed, removed
+
 # ---------- UI ----------
 class Viewer:
     def __init__(self, stdscr, path):
@@ -137,49 +398,200 @@ class Viewer:
         self.path = path
         self.lines = []
         self.styles = []
-        self.view = []        # list[(text, style)]
+        self.view = []        # list[(text, style, runs)]
+        self.toc = []         # list[(line, level, title)], ordered by line
+        self.toc_lines = []   # just the lines, for bisect
         self.offset = 0
         self.h = 0
         self.w = 0
         self.search_q = None
         self.last_found = -1
+        self.pending_bracket = None
+        self.fh = None
+        self.decoder = None   # keeps a character split across reads for the next one
+        self.size = 0
+        self.ino = None
+        self.mark = (0, 0, False)
+        self.watcher = None   # FileWatcher in --follow mode
+        self.tick_ms = -1     # getch timeout: FOLLOW_TICK_MS in --follow mode
+        # Damage tracking: what is currently on each body row of the terminal.
+        # None means the screen contents are unknown and need a full repaint.
+        self.screen = None
+        self.screen_offset = 0
+        self.status_drawn = None
 
     def load(self):
-        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
-            self.lines = f.readlines()
+        # The handle stays open so follow mode can keep reading from where
+        # this left off. Bytes go through an incremental decoder, so a UTF-8
+        # sequence (or \r\n) cut by a write boundary is completed by the
+        # next read instead of turning into U+FFFD.
+        if self.fh:
+            self.fh.close()
+        self.fh = open(self.path, "rb")
+        self.decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder("utf-8")(errors="replace"), translate=True)
+        self.lines = line_re.findall(self.decoder.decode(self.fh.read()))
+        st = os.fstat(self.fh.fileno())
+        self.size, self.ino = st.st_size, st.st_ino
 
     def rerender(self):
         self.h, self.w = self.stdscr.getmaxyx()
-        width = max(20, self.w - 2)
-        self.view = render_markdown(self.lines, width)
+        self.view, self.toc, self.toc_lines = [], [], []
+        self.mark = (0, 0, False)
+        self.render_tail()
         self.offset = min(self.offset, max(0, len(self.view) - self.h + 1))
 
+    def render_tail(self):
+        """Render source lines after the last mark and append them to view.
+
+        The mark is (source lines, rendered lines, in_code) after the last
+        newline-terminated line; a trailing partial line is rendered but
+        stays after the mark, so it is redone once the rest of it arrives.
+        """
+        nlines, nview, in_code = self.mark
+        del self.view[nview:]
+        cut = bisect_left(self.toc_lines, nview)
+        del self.toc[cut:], self.toc_lines[cut:]
+        width = max(20, self.w - 2)
+        tail = self.lines[nlines:]
+        partial = tail.pop() if tail and not tail[-1].endswith("\n") else None
+        for chunk in (tail, [partial] if partial else []):
+            state, toc = {"in_code": in_code}, []
+            base = len(self.view)
+            self.view.extend(render_markdown(chunk, width, toc, state))
+            self.toc.extend((base + line, level, title) for line, level, title in toc)
+            self.toc_lines.extend(base + t[0] for t in toc)
+            if chunk is tail:
+                in_code = state["in_code"]
+                self.mark = (nlines + len(tail), len(self.view), in_code)
+
+    def follow(self):
+        """Pick up changes to a followed file. Returns True if view changed."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        at_bottom = self.offset >= len(self.view) - (self.h - 1)
+        if st.st_ino != self.ino or st.st_size < self.size:
+            # replaced or truncated: start over
+            self.load()
+            self.rerender()
+            if self.watcher:
+                self.watcher.rewatch()
+        elif st.st_size > self.size:
+            data = self.decoder.decode(self.fh.read())
+            self.size = os.fstat(self.fh.fileno()).st_size
+            if not data:
+                return False
+            if self.lines and not self.lines[-1].endswith("\n"):
+                data = self.lines.pop() + data
+            self.lines.extend(line_re.findall(data))
+            self.render_tail()
+        else:
+            return False
+        if at_bottom:
+            self.offset = max(0, len(self.view) - (self.h - 1))
+        self.clamp_offset()
+        return True
+
     def clamp_offset(self):
         maxoff = max(0, len(self.view) - (self.h - 1))
         self.offset = min(max(self.offset, 0), maxoff)
 
+    def invalidate(self):
+        """Forget what is on the terminal; next draw() repaints everything."""
+        self.screen = None
+        self.status_drawn = None
+
+    def row(self, idx):
+        if idx >= len(self.view):
+            return None
+        full, style, runs = self.view[idx]
+        text = truncate(full, self.w-1)
+        if runs and text is not full:
+            runs = clip_runs(runs, 0, len(text) - 1)
+        return text, style, runs
+
+    def draw_row(self, y, row):
+        self.stdscr.move(y, 0)
+        self.stdscr.clrtoeol()
+        if row is None:
+            return
+        text, style, runs = row
+        base = style_attr(style)
+        try:
+            self.stdscr.addstr(y, 0, text, base)
+            for i, (start, end, kind) in enumerate(runs):
+                attr = run_attr(kind, base)
+                # a nested span keeps the emphasis of the spans around it
+                for s, e, k in runs[:i]:
+                    if s <= start and end <= e:
+                        attr |= run_attr(k, base) & ~curses.A_COLOR
+                self.stdscr.chgat(y, start, end - start, attr)
+        except curses.error:
+            pass
+
     def draw(self):
-        self.stdscr.erase()
-        # Body
         body_h = self.h - 1
+        if self.screen is None or len(self.screen) != body_h:
+            self.stdscr.erase()
+            self.screen = [None] * body_h
+            self.screen_offset = self.offset
+            self.status_drawn = None
+
+        # Single-line (or few-line) scrolls: shift what is already on the
+        # terminal with scroll() (scrl) so curses can emit a scroll sequence instead of
+        # repainting every row, then only the exposed rows get redrawn below.
+        delta = self.offset - self.screen_offset
+        if delta and abs(delta) < body_h:
+            self.stdscr.scrollok(True)
+            self.stdscr.setscrreg(0, body_h - 1)
+            self.stdscr.scroll(delta)
+            self.stdscr.scrollok(False)
+            if delta > 0:
+                self.screen = self.screen[delta:] + [None] * delta
+            else:
+                self.screen = [None] * -delta + self.screen[:delta]
+        elif delta:
+            self.screen = [False] * body_h  # nothing reusable, but not blank
+        self.screen_offset = self.offset
+
+        # Body: only touch rows whose content differs from what is drawn
         for i in range(body_h):
-            idx = self.offset + i
-            if idx >= len(self.view):
-                break
-            text, style = self.view[idx]
-            try:
-                self.stdscr.addstr(i, 0, truncate(text, self.w-1), style_attr(style))
-            except curses.error:
-                pass
+            row = self.row(self.offset + i)
+            if self.screen[i] != row:
+                self.draw_row(i, row)
+                self.screen[i] = row
 
         # Status bar
         status = f" {os.path.basename(self.path)}  {self.offset+1}/{len(self.view)}  {HELP}"
         status = truncate(status, self.w-1)
-        try:
-            self.stdscr.addstr(self.h-1, 0, status, curses.A_REVERSE)
-        except curses.error:
-            pass
-        self.stdscr.refresh()
+        if status != self.status_drawn:
+            try:
+                self.stdscr.addstr(self.h-1, 0, status, curses.A_REVERSE)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                pass
+            self.status_drawn = status
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def current_heading(self):
+        """Index into toc of the heading the top of the view is under, or -1."""
+        return bisect_right(self.toc_lines, self.offset) - 1
+
+    def next_heading(self, backwards=False):
+        if backwards:
+            i = bisect_left(self.toc_lines, self.offset) - 1
+        else:
+            i = bisect_right(self.toc_lines, self.offset)
+        if 0 <= i < len(self.toc_lines):
+            self.offset = self.toc_lines[i]
+
+    def jump_heading(self, query):
+        i = fuzzy_best(query, [t[2] for t in self.toc])
+        if i is not None:
+            self.offset = self.toc_lines[i]
 
     def search(self, query, backwards=False):
         if not query:
@@ -201,6 +613,78 @@ class Viewer:
                 self.offset = max(0, idx - 1)
                 return
 
+def fuzzy_score(query, title):
+    """Lower is better; None when query is not a subsequence of title."""
+    q, t = query.lower(), title.lower()
+    pos = t.find(q)
+    if pos != -1:
+        return pos  # plain substring beats any scattered match
+    score, last = len(t), -1
+    for ch in q:
+        nxt = t.find(ch, last + 1)
+        if nxt == -1:
+            return None
+        score += nxt - last - 1  # penalise gaps between matched chars
+        last = nxt
+    return score
+
+def fuzzy_best(query, titles):
+    best, best_i = None, None
+    if not query:
+        return None
+    for i, title in enumerate(titles):
+        sc = fuzzy_score(query, title)
+        if sc is not None and (best is None or sc < best):
+            best, best_i = sc, i
+    return best_i
+
+def toc_popup(v):
+    """Modal heading list; Enter jumps to the selected heading."""
+    if not v.toc:
+        return
+    hh = min(len(v.toc) + 2, v.h - 2)
+    ww = min(max(len(t[2]) + 2 * t[1] for t in v.toc) + 4, v.w - 4)
+    if hh < 3 or ww < 10:
+        return
+    win = curses.newwin(hh, ww, (v.h - hh) // 2, (v.w - ww) // 2)
+    win.keypad(True)
+    sel = max(0, v.current_heading())
+    top = 0
+    rows = hh - 2
+    while True:
+        top = min(max(top, sel - rows + 1), sel)
+        win.erase()
+        win.box()
+        win.addstr(0, 2, truncate(" Contents ", ww - 4))
+        for i in range(rows):
+            idx = top + i
+            if idx >= len(v.toc):
+                break
+            _, level, title = v.toc[idx]
+            text = truncate("  " * (level - 1) + title, ww - 4)
+            attr = curses.A_REVERSE if idx == sel else style_attr(f"h{level}")
+            win.addstr(1 + i, 2, text, attr)
+        win.refresh()
+        ch = win.getch()
+        if ch in (curses.KEY_DOWN, ord('j')):
+            sel = min(sel + 1, len(v.toc) - 1)
+        elif ch in (curses.KEY_UP, ord('k')):
+            sel = max(sel - 1, 0)
+        elif ch in (curses.KEY_NPAGE,):
+            sel = min(sel + rows, len(v.toc) - 1)
+        elif ch in (curses.KEY_PPAGE,):
+            sel = max(sel - rows, 0)
+        elif ch in (10, 13, curses.KEY_ENTER):
+            v.offset = v.toc_lines[sel]
+            break
+        elif ch == curses.KEY_RESIZE:
+            # close, and let handle_key re-render for the new size
+            curses.ungetch(ch)
+            break
+        elif ch in (ord('q'), ord('t'), 27):
+            break
+    del win
+
 def truncate(s, width):
     return s if len(s) <= width else s[:max(0, width-1)] + "…"
 
@@ -230,6 +714,19 @@ def style_attr(style):
     }
     return mapping.get(style, curses.color_pair(0))
 
+def run_attr(kind, base):
+    if kind == "code":
+        return style_attr("code")
+    if kind == "bold":
+        return base | curses.A_BOLD
+    if kind == "em":
+        return base | getattr(curses, "A_ITALIC", curses.A_UNDERLINE)
+    if kind == "link":
+        return style_attr("quote") | curses.A_UNDERLINE
+    if kind == "url":
+        return base | curses.A_DIM
+    return base
+
 def init_colors():
     if curses.has_colors():
         curses.start_color()
@@ -244,77 +741,153 @@ def init_colors():
         curses.init_pair(7, curses.COLOR_BLACK,  curses.COLOR_WHITE)  # code
         curses.init_pair(8, curses.COLOR_WHITE,  -1)   # hr
 
-def prompt(stdscr, msg):
+def prompt(stdscr, msg, timeout=-1):
+    """Read a line on the bottom row; `timeout` is the getch timeout to restore."""
     h, w = stdscr.getmaxyx()
     stdscr.addstr(h-1, 0, " " * (w-1), curses.A_REVERSE)
     stdscr.addstr(h-1, 0, msg, curses.A_REVERSE)
     curses.echo()
     curses.curs_set(1)
     stdscr.refresh()
+    # getstr gives up at the first timeout, so block while typing
+    stdscr.timeout(-1)
     try:
         s = stdscr.getstr(h-1, len(msg)).decode("utf-8")
     except Exception:
         s = ""
+    finally:
+        stdscr.timeout(timeout)
     curses.noecho()
     curses.curs_set(0)
     return s
 
-def main(stdscr, path):
+def handle_key(v, ch):
+    """Apply one keypress to the viewer. Returns False when it asks to quit."""
+    stdscr = v.stdscr
+    if v.pending_bracket:
+        # second key of [[ / ]]
+        first, v.pending_bracket = v.pending_bracket, None
+        if ch == first:
+            v.next_heading(backwards=(ch == ord('[')))
+            v.clamp_offset()
+            return True
+    if ch in (ord('q'), 27):  # q or Esc
+        return False
+    elif ch in (ord('['), ord(']')):
+        v.pending_bracket = ch
+    elif ch in (curses.KEY_RESIZE,):
+        v.rerender()
+        v.invalidate()
+    elif ch in (curses.KEY_DOWN, ord('j')):
+        v.offset += 1
+    elif ch in (curses.KEY_UP, ord('k')):
+        v.offset -= 1
+    elif ch in (curses.KEY_NPAGE,):  # PgDn
+        v.offset += (v.h - 2)
+    elif ch in (curses.KEY_PPAGE,):  # PgUp
+        v.offset -= (v.h - 2)
+    elif ch in (ord('g'),):
+        v.offset = 0
+    elif ch in (ord('G'),):
+        v.offset = max(0, len(v.view) - v.h + 1)
+    elif ch in (ord('r'),):
+        # reload
+        try:
+            v.load()
+            v.rerender()
+        except Exception:
+            pass
+    elif ch == ord('/'):
+        q = prompt(stdscr, "/", v.tick_ms)
+        v.status_drawn = None  # prompt painted over the status bar
+        v.search_q = q
+        v.search(q, backwards=False)
+    elif ch in (ord('n'),):
+        if v.search_q:
+            v.search(v.search_q, backwards=False)
+    elif ch in (ord('N'),):
+        if v.search_q:
+            v.search(v.search_q, backwards=True)
+    elif ch == ord('t'):
+        toc_popup(v)
+        v.invalidate()
+    elif ch == ord('#'):
+        q = prompt(stdscr, "#", v.tick_ms)
+        v.status_drawn = None
+        v.jump_heading(q)
+    v.clamp_offset()
+    return True
+
+def pending_key(stdscr):
+    """Next already-queued key, or -1 without waiting."""
+    stdscr.nodelay(True)
+    try:
+        return stdscr.getch()
+    finally:
+        stdscr.nodelay(False)
+
+def main(stdscr, path, follow=False):
     curses.curs_set(0)
     stdscr.keypad(True)
+    stdscr.idlok(True)  # allow hardware line insert/delete for scroll()
     init_colors()
 
     v = Viewer(stdscr, path)
     v.load()
     v.rerender()
+    if follow:
+        v.tick_ms = FOLLOW_TICK_MS
+        v.watcher = FileWatcher(path)
+        v.offset = len(v.view)
+        v.clamp_offset()
     v.draw()
 
     while True:
+        # Follow mode wakes up every tick to check the file; otherwise block.
+        stdscr.timeout(v.tick_ms)
         ch = stdscr.getch()
-        if ch in (ord('q'), 27):  # q or Esc
-            break
-        elif ch in (curses.KEY_RESIZE,):
-            v.rerender()
-        elif ch in (curses.KEY_DOWN, ord('j')):
-            v.offset += 1
-        elif ch in (curses.KEY_UP, ord('k')):
-            v.offset -= 1
-        elif ch in (curses.KEY_NPAGE,):  # PgDn
-            v.offset += (v.h - 2)
-        elif ch in (curses.KEY_PPAGE,):  # PgUp
-            v.offset -= (v.h - 2)
-        elif ch in (ord('g'),):
-            v.offset = 0
-        elif ch in (ord('G'),):
-            v.offset = max(0, len(v.view) - v.h + 1)
-        elif ch in (ord('r'),):
-            # reload
-            try:
-                v.load()
-                v.rerender()
-            except Exception:
-                pass
-        elif ch == ord('/'):
-            q = prompt(stdscr, "/")
-            v.search_q = q
-            v.search(q, backwards=False)
-        elif ch in (ord('n'),):
-            if v.search_q:
-                v.search(v.search_q, backwards=False)
-        elif ch in (ord('N'),):
-            if v.search_q:
-                v.search(v.search_q, backwards=True)
-
-        v.clamp_offset()
+        if ch == -1:
+            if follow and v.watcher.changed() and v.follow():
+                v.draw()
+            continue
+        # Coalesce: apply every key already queued (e.g. a held `j`) and
+        # then paint a single frame for all of them.
+        while ch != -1:
+            if not handle_key(v, ch):
+                return
+            ch = pending_key(stdscr)
         v.draw()
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: mdview.py <file.md>")
-        sys.exit(1)
-    path = sys.argv[1]
-    if not os.path.isfile(path):
-        print(f"Not found: {path}")
+    ap = argparse.ArgumentParser(prog="mdview.py", description="curses Markdown viewer")
+    ap.add_argument("path", metavar="file.md", nargs="?")
+    ap.add_argument("-f", "--follow", action="store_true",
+                    help="keep reading as the file grows (like tail -f)")
+    batch = ap.add_argument_group("batch rendering (no UI)")
+    batch.add_argument("--render", metavar="DIR", help="render every .md under DIR")
+    batch.add_argument("--out", metavar="DIR", help="output directory for --render")
+    batch.add_argument("--width", type=int, default=80, help="render width (default 80)")
+    batch.add_argument("--format", choices=("text", "ansi"), default="text")
+    batch.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    args = ap.parse_args()
+    if args.render:
+        if not args.out:
+            ap.error("--render needs --out")
+        if args.jobs is not None and args.jobs < 1:
+            ap.error("--jobs must be at least 1")
+        if not os.path.isdir(args.render):
+            print(f"Not found: {args.render}")
+            sys.exit(1)
+        t0 = time.time()
+        done, skipped, failed, removed = render_tree(args.render, args.out, max(20, args.width),
+                                                     args.format, args.jobs)
+        print(f"rendered {done}, unchanged {skipped}, failed {failed}, removed {removed} "
+              f"in {time.time() - t0:.2f}s")
+        sys.exit(1 if failed else 0)
+    if not args.path:
+        ap.error("a file to view is required")
+    if not os.path.isfile(args.path):
+        print(f"Not found: {args.path}")
         sys.exit(1)
-    curses.wrapper(main, path)
+    curses.wrapper(main, args.path, args.follow)
 